@@ -2,8 +2,15 @@
 
 from argparse import ArgumentParser
 import csv
+import os
 import re
 import json
+import sys
+
+# The best solvers of a track are computed from its results with score.py.
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "scoring"))
+import score
 
 WINNER_NAME_COL = 'name'
 WINNER_DIV_COL = 'division'
@@ -27,6 +34,9 @@ trackreg2index = {"Single Query Track" : 0,
 
 track2index = {"Single Query" : 0, "Unsat Core" : 1, "Incremental" : 2, "Model Validation" : 3}
 
+# The tracks of score.py (option -T) in the order of the winner files.
+SCORE_TRACKS = ["sq", "uc", "inc", "mv"]
+
 RAW_TRACK_NAMES = {
     REG_SQDIVS_COL : "track_single_query",
     REG_INDIVS_COL : "track_incremental",
@@ -75,27 +85,70 @@ def parse_args():
             required=False,
             help="The json file mapping divisions to smtlib-logics")
 
-    required = parser.add_argument_group("required arguments")
-    required.add_argument("-s", "--single-query",
+    winners = parser.add_argument_group(
+            "winners of each track, either as csv (as written by "\
+            "score.py --bestof) or computed from the results csv of the "\
+            "track with score.py")
+    winners.add_argument("-s", "--single-query",
             action="store",
             dest="sq_winners",
-            required=True,
+            default=None,
             help="The csv containing single-query winners")
-    required.add_argument("-u", "--unsat-core",
+    winners.add_argument("-u", "--unsat-core",
             action="store",
             dest="uc_winners",
-            required=True,
+            default=None,
             help="The csv containing unsat-core winners")
-    required.add_argument("-i", "--incremental",
+    winners.add_argument("-i", "--incremental",
             action="store",
             dest="in_winners",
-            required=True,
+            default=None,
             help="The csv containing incremental winners")
-    required.add_argument("-m", "--model-validation",
+    winners.add_argument("-m", "--model-validation",
             action="store",
             dest="mv_winners",
-            required=True,
+            default=None,
             help="The csv containing model validation winners")
+    winners.add_argument("--single-query-results",
+            action="store",
+            dest="sq_results",
+            default=None,
+            help="The csv containing the single-query results")
+    winners.add_argument("--unsat-core-results",
+            action="store",
+            dest="uc_results",
+            default=None,
+            help="The csv containing the unsat-core results")
+    winners.add_argument("--incremental-results",
+            action="store",
+            dest="in_results",
+            default=None,
+            help="The csv containing the incremental results")
+    winners.add_argument("--model-validation-results",
+            action="store",
+            dest="mv_results",
+            default=None,
+            help="The csv containing the model validation results")
+    winners.add_argument("--num-check-sat",
+            action="store",
+            dest="num_check_sat",
+            default=None,
+            help="The csv containing the number of check-sat calls of "\
+                "the incremental benchmarks")
+    winners.add_argument("-t", "--time-limit",
+            action="store",
+            dest="time_limit",
+            default=None,
+            type=int,
+            help="The time limit of the old results")
+    winners.add_argument("--cache-dir",
+            action="store",
+            dest="cache_dir",
+            default=None,
+            help="Directory for caching the normalized results (see "\
+                "score.py)")
+
+    required = parser.add_argument_group("required arguments")
     required.add_argument("-o", "--old-registration",
             action="store",
             dest="old_registration",
@@ -116,6 +169,53 @@ def parse_args():
 
     g_args = parser.parse_args()
 
+    for winners, results in [(g_args.sq_winners, g_args.sq_results),
+                             (g_args.uc_winners, g_args.uc_results),
+                             (g_args.in_winners, g_args.in_results),
+                             (g_args.mv_winners, g_args.mv_results)]:
+        if (winners is None) == (results is None):
+            parser.error("either the winners csv or the results csv of "\
+                         "each track is required")
+        if results is not None and g_args.time_limit is None:
+            parser.error("the time limit is required for results csvs")
+    if g_args.in_results is not None and g_args.num_check_sat is None:
+        parser.error("the number of check-sat calls is required for the "\
+                     "incremental results")
+
+# Read the winners of a track from a csv with the division, name and
+# configuration id of each winner as written by score.py --bestof.
+#
+# returns a list of tuples (name, division, configuration id)
+def readWinners(winners_csv):
+    with open(winners_csv) as csvfile:
+        return [(row[WINNER_NAME_COL],
+                 row[WINNER_DIV_COL],
+                 row[WINNER_CONFIG_COL]) for row in csv.DictReader(csvfile)]
+
+# Compute the winners of a track from its results csv with the best solver
+# query of score.py, which reads the results only once for the sequential
+# and the parallel score (the winners of both scores are the best solvers).
+# From 2021 on, the winners are computed per division of the divisions map
+# (option -d), as expected by getLogics.
+#
+# returns a list of tuples (name, division, configuration id)
+def queryWinners(track, results_csv):
+    global g_args
+    divisions = None
+    if g_args.divisions and g_args.old_year >= 2021:
+        divisions = g_args.divisions
+    best = score.query_best_solvers(
+            {str(g_args.old_year): (results_csv, g_args.time_limit)},
+            track,
+            g_args.old_registration,
+            divisions_map=divisions,
+            num_check_sat=g_args.num_check_sat if track == "inc" else None,
+            cache_dir=g_args.cache_dir,
+            sequentials=[False, True])
+    return list(zip(best[WINNER_NAME_COL].tolist(),
+                    best[WINNER_DIV_COL].astype(str).tolist(),
+                    best[WINNER_CONFIG_COL].astype(str).tolist()))
+
 # return a dictionary that maps
 # track -> logic -> D
 # where D is the set of logics in the track's division that contains
@@ -172,22 +272,22 @@ if __name__ == '__main__':
 
     winner_files= [g_args.sq_winners, g_args.uc_winners, \
             g_args.in_winners, g_args.mv_winners]
+    results_files = [g_args.sq_results, g_args.uc_results, \
+            g_args.in_results, g_args.mv_results]
 
     winners = {}
 
     for i in range(0, len(winner_files)):
-        f = winner_files[i]
-        with open(f) as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                name = row[WINNER_NAME_COL]
-                div = row[WINNER_DIV_COL]
-                config = row[WINNER_CONFIG_COL]
-                if name not in winners:
-                    winners[name] = \
-                            [[] for k in range(0, len(winner_files))]
-                assert(i < len(winners[name]))
-                winners[name][i].append([div, config])
+        if winner_files[i] is not None:
+            track_winners = readWinners(winner_files[i])
+        else:
+            track_winners = queryWinners(SCORE_TRACKS[i], results_files[i])
+        for name, div, config in track_winners:
+            if name not in winners:
+                winners[name] = \
+                        [[] for k in range(0, len(winner_files))]
+            assert(i < len(winners[name]))
+            winners[name][i].append([div, config])
 
     new_header = None
     with open(g_args.new_registration) as new_registration:
@@ -29,6 +29,12 @@ import math
 import time
 import datetime
 
+# The results cache is shared with the scoring script.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir, 'scoring'))
+from score import get_results_cache_path, write_results_cache, \
+                  read_results_cache
+
 # StarExec result strings
 RESULT_UNKNOWN = 'starexec-unknown'
 RESULT_SAT = 'sat'
@@ -83,6 +89,9 @@ EXT_PE = "-proof-exhibition.md"
 EXT_CLOUD = "-cloud.md"
 EXT_PARALLEL = "-parallel.md"
 
+# Columns of the normalized results data that are stored as categoricals.
+CATEGORICAL_COLUMNS = ['logic', 'family', 'solver', 'status', 'result']
+
 g_args = None
 
 g_competitive = {}
@@ -279,6 +288,66 @@ def remove_disagreements(data):
     return data
 
 
+# Store the string columns with few distinct values of normalized results data
+# as categoricals. The categories include the values that are assigned during
+# scoring.
+def set_results_dtypes(data):
+    for col in CATEGORICAL_COLUMNS:
+        data[col] = data[col].astype('category')
+    for col, values in [('status', ['timeout', 'memout']),
+                        ('result', [RESULT_UNKNOWN])]:
+        categories = data[col].cat.categories
+        data[col] = data[col].cat.add_categories(
+                [v for v in values if v not in categories])
+    return data
+
+# Read the CSV file with the results and normalize it.
+def normalize_results_csv(csv):
+    data = pandas.read_csv(csv, keep_default_na=False)
+
+    # Remove spaces from columns for ease (other functions rely on this)
+    cols = data.columns
+    cols = cols.map(lambda x: x.replace(' ', '_'))
+    data.columns = cols
+
+    incremental = 'wrong-answers' in data.columns
+
+    # For incremental tracks, the CSV does not contain the 'expected' column.
+    if incremental:
+        assert 'expected' not in data.columns
+        data['expected'] = None
+
+    # Make sure that the expected column contains RESULT_SAT, RESULT_UNSAT or
+    # RESULT_UNKNOWN. For some exported StarExec data, the expected column is
+    # '-', which can happen when extracting the status of a benchmark fails
+    # while uploading the benchmark to StarExec.
+    data.loc[~data.expected.isin({RESULT_SAT, RESULT_UNSAT}),
+             'expected'] = RESULT_UNKNOWN
+
+    return add_division_family_info(data, "bot")
+
+# Read the normalized results of the CSV file, from the results cache if
+# option --cache-dir is given and the CSV file was already normalized.
+# Note: The division column depends on the divisions map and is not cached.
+def read_results_csv(csv):
+    global g_args, g_logic_to_division
+    cache_path = None
+    if g_args.cache_dir:
+        if not os.path.exists(g_args.cache_dir):
+            os.makedirs(g_args.cache_dir)
+        cache_path = get_results_cache_path(
+                g_args.cache_dir, csv, "logic-bot")
+    if cache_path and os.path.exists(cache_path):
+        data = read_results_cache(cache_path)
+    else:
+        data = set_results_dtypes(
+                normalize_results_csv(csv).drop(columns=['division']))
+        if cache_path:
+            write_results_cache(data, cache_path)
+    data['division'] = data['logic'].map(g_logic_to_division)
+    return data
+
+
 ###############################################################################
 # Main
 ###############################################################################
@@ -301,6 +370,11 @@ def parse_args():
                         action="store_true",
                         default=False,
                         help="Enable logging")
+    parser.add_argument("--cache-dir",
+                        metavar="dir",
+                        default=None,
+                        help="Directory for caching the normalized results "\
+                             "of the input csv (requires pyarrow)")
 
     required = parser.add_argument_group("required arguments")
     required.add_argument("-c", "--csv",
@@ -517,7 +591,7 @@ def score(
     # Set alpha_prime_b for each benchmark, set to 1 if family is not in the
     # 'family_scores' dictionary (use_families == False).
     data_new['alpha_prime_b'] = \
-        data_new.family.map(lambda x: family_scores.get(x, 1))
+        data_new.family.map(lambda x: family_scores.get(x, 1)).astype(float)
 
     if use_families:
         data_new['score_modifier'] = \
@@ -546,28 +620,7 @@ def main():
     read_solvers_csv()
     read_logic_to_division()
 
-    data = pandas.read_csv(g_args.csv, keep_default_na=False)
-
-    # Remove spaces from columns for ease (other functions rely on this)
-    cols = data.columns
-    cols = cols.map(lambda x: x.replace(' ', '_'))
-    data.columns = cols
-
-    incremental = 'wrong-answers' in data.columns
-
-    # For incremental tracks, the CSV does not contain the 'expected' column.
-    if incremental:
-        assert 'expected' not in data.columns
-        data['expected'] = None
-
-    # Make sure that the expected column contains RESULT_SAT, RESULT_UNSAT or
-    # RESULT_UNKNOWN. For some exported StarExec data, the expected column is
-    # '-', which can happen when extracting the status of a benchmark fails
-    # while uploading the benchmark to StarExec.
-    data.loc[~data.expected.isin({RESULT_SAT, RESULT_UNSAT}),
-             'expected'] = RESULT_UNKNOWN
-
-    data = add_division_family_info(data, "bot")
+    data = read_results_csv(g_args.csv)
 
     data = remove_disagreements(data)
 
@@ -590,7 +643,7 @@ def main():
 
     with open(g_args.out, "w") as outfile:
         data_gen = data.drop(columns=["benchmark_id"])
-        data_gen=data_gen.groupby(by=["solver_id","division","logic","result","time","competitive"],as_index=False).sum()
+        data_gen=data_gen.groupby(by=["solver_id","division","logic","result","time","competitive"],as_index=False,observed=True).sum()
         data_gen['solver']  = data_gen.solver_id.map(get_solver_name)
         data_gen.drop(columns=["solver_id"],inplace=True)
         data_gen.to_csv(path_or_buf=outfile, sep=',',index=False)
@@ -598,7 +651,7 @@ def main():
     data.sort_values("benchmark_id",inplace=True)
     with open(os.path.join(os.path.dirname(g_args.out),"results/benchmarks.csv"), "w") as outfile:
         data_gen=data.drop(columns=["result","time","solver_id","result","competitive","nb","cpu_time","wallclock_time"])
-        data_gen=data_gen.groupby(by=["benchmark_id","division","logic"],as_index=False).first()
+        data_gen=data_gen.groupby(by=["benchmark_id","division","logic"],as_index=False,observed=True).first()
         data_gen.to_csv(path_or_buf=outfile, sep=',',index=False)
 
     data.drop(columns=["division","logic","expected","time","competitive","nb"],inplace=True)
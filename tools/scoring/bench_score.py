@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+#
+# This script measures the runtime of the main stages of score.py on a csv
+# with results of one track, e.g., as generated by gen_results_csv.py.
+#
+# All options not listed below are passed to score.py, e.g.:
+#
+#   ./gen_results_csv.py -o gen --divisions 20 --benchmarks 5000
+#   ./bench_score.py -r 3 -c gen/results.csv -y 2023 -t 1200 \
+#       -S gen/solvers.csv
+#
+# This script requires the pandas data analysis framework
+
+from argparse import ArgumentParser
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import score
+
+g_args = None
+
+# The benchmark scenarios in the order they are run.
+g_scenarios = ['read_results_csv',
+               'process_csv',
+               'process_csv_scenarios',
+               'group_and_rank_solvers',
+               'biggest_lead_ranking',
+               'largest_contribution_ranking']
+
+
+# Print error message and exit.
+def die(msg):
+    print("error: {}".format(msg))
+    sys.exit(1)
+
+
+# Run 'fun' g_args.repeat times and return the runtimes in seconds.
+def measure(fun):
+    global g_args
+    times = []
+    for i in range(g_args.repeat):
+        start = time.perf_counter()
+        fun()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+# Run the benchmark scenarios on the results of the given year.
+#
+# returns: a dictionary that maps each scenario to its runtimes
+def run_scenarios(year):
+    global g_args
+    csv, time_limit = score.g_args.csv[year]
+    sequential = score.g_args.sequential
+    # The five scenarios scored for the results .md files.
+    md_scenarios = [
+        (time_limit, None, score.g_args.use_families,
+         score.g_args.skip_unknowns, True),
+        (time_limit, None, score.g_args.use_families,
+         score.g_args.skip_unknowns, False),
+        (time_limit, score.RESULT_SAT, score.g_args.use_families,
+         score.g_args.skip_unknowns, False),
+        (time_limit, score.RESULT_UNSAT, score.g_args.use_families,
+         score.g_args.skip_unknowns, False),
+        (24, None, score.g_args.use_families,
+         score.g_args.skip_unknowns, False)]
+
+    data = score.process_csv(csv,
+                             year,
+                             time_limit,
+                             None,
+                             score.g_args.use_families,
+                             score.g_args.skip_unknowns,
+                             sequential)
+    funs = {
+        'read_results_csv':
+            lambda: score.read_results_csv(csv),
+        'process_csv':
+            lambda: score.process_csv(csv,
+                                      year,
+                                      time_limit,
+                                      None,
+                                      score.g_args.use_families,
+                                      score.g_args.skip_unknowns,
+                                      sequential),
+        'process_csv_scenarios':
+            lambda: score.process_csv_scenarios(csv, year, md_scenarios),
+        'group_and_rank_solvers':
+            lambda: score.group_and_rank_solvers(data, sequential),
+        'biggest_lead_ranking':
+            lambda: score.biggest_lead_ranking(data, sequential),
+        'largest_contribution_ranking':
+            lambda: score.largest_contribution_ranking(
+                data, time_limit, sequential),
+    }
+
+    results = {}
+    for scenario in g_scenarios:
+        if scenario not in g_args.scenarios:
+            continue
+        times = measure(funs[scenario])
+        results[scenario] = times
+        print("{:<30} min {:9.3f}s  mean {:9.3f}s".format(
+            scenario, min(times), sum(times) / len(times)))
+    return results, len(data)
+
+
+def parse_args():
+    global g_args
+    parser = ArgumentParser(
+            description="Measure the runtime of the stages of score.py, "\
+                        "all other options are passed to score.py")
+    parser.add_argument("-r", "--repeat",
+                        type=int,
+                        default=3,
+                        help="number of runs of each scenario")
+    parser.add_argument("--scenarios",
+                        metavar="scenario[,scenario...]",
+                        default=','.join(g_scenarios),
+                        help="list of scenarios to run (default: all of "\
+                             "{})".format(', '.join(g_scenarios)))
+    parser.add_argument("--json",
+                        metavar="file",
+                        default=None,
+                        help="write the runtimes to the given json file")
+    g_args, score_argv = parser.parse_known_args()
+    g_args.scenarios = g_args.scenarios.split(',')
+    for scenario in g_args.scenarios:
+        if scenario not in g_scenarios:
+            die("Unknown scenario: {}".format(scenario))
+    if g_args.repeat < 1:
+        die("Number of runs must be at least 1")
+    sys.argv = [sys.argv[0]] + score_argv
+    score.parse_args()
+
+
+def main():
+    global g_args
+    parse_args()
+    score.read_solvers_csv()
+
+    results = {}
+    for year in score.g_args.csv:
+        csv = score.g_args.csv[year][0]
+        if not os.path.exists(csv):
+            die("Given csv does not exist: {}".format(csv))
+        print("{} ({})".format(csv, year))
+        times, num_job_pairs = run_scenarios(year)
+        results[year] = {
+            'csv': csv,
+            'job_pairs': num_job_pairs,
+            'times': times,
+        }
+
+    if g_args.json:
+        with open(g_args.json, 'w') as outfile:
+            json.dump(results, outfile, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+#
+# This script generates synthetic results of a track in the format of the
+# StarExec CSV files (as exported for the competition), together with a
+# matching solvers csv and, for the incremental track, a csv with the number
+# of check-sat calls per benchmark.
+#
+# The generated files can be scored with score.py and are used by
+# bench_score.py to measure the performance of score.py offline.
+#
+# This script requires the pandas data analysis framework
+
+from argparse import ArgumentParser
+import os
+import sys
+
+import numpy
+import pandas
+
+RESULT_UNKNOWN = 'starexec-unknown'
+RESULT_SAT = 'sat'
+RESULT_UNSAT = 'unsat'
+
+OPT_TRACK_SQ = "sq"
+OPT_TRACK_INC = "inc"
+OPT_TRACK_UC = "uc"
+OPT_TRACK_MV = "mv"
+OPT_TRACK_PE = "pe"
+
+# Columns of the solvers csv with configuration ids (see score.py).
+g_config_id_columns = {
+    OPT_TRACK_SQ: "Config ID Single Query",
+    OPT_TRACK_INC: "Config ID Incremental",
+    OPT_TRACK_UC: "Config ID Unsat Core",
+    OPT_TRACK_MV: "Config ID Model Validation",
+    OPT_TRACK_PE: "Config ID Proof Exhibition",
+}
+
+# Logics used as division names. If more divisions are requested, the logics
+# are reused with a numeric suffix.
+g_logics = [
+    'ABV', 'ALIA', 'AUFBV', 'AUFLIA', 'AUFLIRA', 'AUFNIRA', 'BV', 'BVFP',
+    'FP', 'LIA', 'LRA', 'NIA', 'NRA', 'QF_ABV', 'QF_ALIA', 'QF_AUFBV',
+    'QF_AUFLIA', 'QF_AX', 'QF_BV', 'QF_BVFP', 'QF_DT', 'QF_FP', 'QF_IDL',
+    'QF_LIA', 'QF_LIRA', 'QF_LRA', 'QF_NIA', 'QF_NRA', 'QF_RDL', 'QF_S',
+    'QF_SLIA', 'QF_UF', 'QF_UFBV', 'QF_UFLIA', 'QF_UFLRA', 'QF_UFNIA', 'UF',
+    'UFDT', 'UFLIA', 'UFNIA',
+]
+
+g_args = None
+
+
+# Print error message and exit.
+def die(msg):
+    print("error: {}".format(msg))
+    sys.exit(1)
+
+
+# Get the names of the divisions to generate.
+def get_divisions(num_divisions):
+    divisions = []
+    for i in range(num_divisions):
+        logic = g_logics[i % len(g_logics)]
+        n = i // len(g_logics)
+        divisions.append(logic if n == 0 else "{}X{}".format(logic, n))
+    return divisions
+
+
+# Generate the benchmarks of all divisions.
+#
+# returns: a dataframe with one row per benchmark and columns 'benchmark'
+#          (the benchmark path including the division), 'benchmark id',
+#          'division', 'expected', 'truth' (the actual status of benchmarks
+#          with expected status unknown) and 'disagreement' (if solvers
+#          disagree on the benchmark)
+def gen_benchmarks(rng):
+    global g_args
+    divisions = get_divisions(g_args.divisions)
+    n = g_args.benchmarks
+    division = numpy.repeat(numpy.arange(len(divisions)), n)
+    index = numpy.tile(numpy.arange(n), len(divisions))
+    family = rng.integers(0, g_args.families, len(division))
+    # Two directory levels, such that the top-most and the bottom-most
+    # directory define different families.
+    subfamily = rng.integers(0, 3, len(division))
+    paths = pandas.Series(numpy.array(divisions, dtype=object)[division]) \
+            + '/family' + pandas.Series(family).astype(str) \
+            + '/set' + pandas.Series(subfamily).astype(str) \
+            + '/bench' + pandas.Series(index).astype(str) + '.smt2'
+
+    status = rng.random(len(division))
+    expected = numpy.where(
+            status < g_args.unknown_rate, RESULT_UNKNOWN,
+            numpy.where(status < (1 + g_args.unknown_rate) / 2,
+                        RESULT_SAT, RESULT_UNSAT))
+    truth = numpy.where(rng.random(len(division)) < 0.5,
+                        RESULT_SAT, RESULT_UNSAT)
+    truth = numpy.where(expected == RESULT_UNKNOWN, truth, expected)
+    disagreement = (expected == RESULT_UNKNOWN) \
+                   & (rng.random(len(division)) < g_args.disagreement_rate)
+    return pandas.DataFrame({
+        'benchmark': paths,
+        'benchmark id': numpy.arange(len(division)) + 1000000,
+        'division': division,
+        'expected': expected,
+        'truth': truth,
+        'disagreement': disagreement,
+    })
+
+
+# Generate the solvers.
+#
+# returns: a dataframe with one row per solver and columns 'solver',
+#          'solver id', 'configuration', 'configuration id', 'competing',
+#          'strength' (probability to solve a benchmark) and 'speed'
+#          (median runtime in seconds)
+def gen_solvers(rng):
+    global g_args
+    n = g_args.solvers
+    names = ['solver{}'.format(i) for i in range(n)]
+    competing = numpy.arange(n) >= round(n * g_args.noncompetitive_rate)
+    return pandas.DataFrame({
+        'solver': names,
+        'solver id': numpy.arange(n) + 20000,
+        'configuration': ['default'] * n,
+        'configuration id': numpy.arange(n) + 300000,
+        'competing': competing,
+        'strength': rng.uniform(0.4, 0.95, n),
+        'speed': rng.uniform(0.5, 20.0, n),
+    })
+
+
+# Generate the job pairs of all solvers on all benchmarks of the divisions
+# they participate in.
+def gen_job_pairs(rng, benchmarks, solvers):
+    global g_args
+    num_divisions = g_args.divisions
+    participates = rng.random((len(solvers), num_divisions)) \
+                   < g_args.participation
+    # Every division has at least two solvers.
+    participates[:2, :] = True
+
+    pairs_solver = []
+    pairs_benchmark = []
+    by_division = benchmarks.groupby('division').indices
+    for division in range(num_divisions):
+        bench_idx = by_division[division]
+        solver_idx = numpy.flatnonzero(participates[:, division])
+        pairs_solver.append(numpy.repeat(solver_idx, len(bench_idx)))
+        pairs_benchmark.append(numpy.tile(bench_idx, len(solver_idx)))
+    s = numpy.concatenate(pairs_solver)
+    b = numpy.concatenate(pairs_benchmark)
+    n = len(s)
+
+    strength = solvers.strength.to_numpy()[s]
+    speed = solvers.speed.to_numpy()[s]
+    cpu_time = speed * rng.lognormal(0.0, 2.0, n)
+    wallclock_time = cpu_time * rng.uniform(0.95, 1.05, n)
+    solved = (rng.random(n) < strength) & (wallclock_time <= g_args.time)
+    memout = ~solved & (rng.random(n) < g_args.memout_rate)
+    timeout = ~solved & ~memout
+    cpu_time = numpy.where(timeout, numpy.maximum(cpu_time, g_args.time),
+                           cpu_time)
+    wallclock_time = numpy.where(timeout,
+                                 numpy.maximum(wallclock_time, g_args.time),
+                                 wallclock_time)
+    status = numpy.where(timeout, 'timeout (wallclock)',
+                         numpy.where(memout, 'memout', 'complete'))
+
+    expected = benchmarks.expected.to_numpy()[b]
+    truth = benchmarks.truth.to_numpy()[b]
+    flipped = numpy.where(truth == RESULT_SAT, RESULT_UNSAT, RESULT_SAT)
+    # Wrong answers of solvers on benchmarks with known status, and
+    # disagreeing solvers on benchmarks with unknown status (solvers with an
+    # even index answer correctly, solvers with an odd index the opposite).
+    wrong = rng.random(n) < g_args.error_rate
+    disagree = benchmarks.disagreement.to_numpy()[b] & (s % 2 == 1)
+    result = numpy.where(wrong | disagree, flipped, truth)
+    result = numpy.where(solved, result, RESULT_UNKNOWN)
+
+    data = pandas.DataFrame({
+        'pair id': numpy.arange(n) + 1,
+        'benchmark': benchmarks.benchmark.to_numpy()[b],
+        'benchmark id': benchmarks['benchmark id'].to_numpy()[b],
+        'solver': solvers.solver.to_numpy()[s],
+        'solver id': solvers['solver id'].to_numpy()[s],
+        'configuration': solvers.configuration.to_numpy()[s],
+        'configuration id': solvers['configuration id'].to_numpy()[s],
+        'status': status,
+        'cpu time': cpu_time.round(3),
+        'wallclock time': wallclock_time.round(3),
+        'memory usage': rng.uniform(10.0, 1000.0, n).round(1),
+        'result': result,
+        'expected': expected,
+    })
+    return data, solved, s, b
+
+
+# Add the track specific columns to the job pairs.
+#
+# returns: the job pairs and, for the incremental track, the number of
+#          check-sat calls per benchmark (else None)
+def add_track_columns(rng, data, solved, benchmarks):
+    global g_args
+    n = len(data)
+    sat = data.result.to_numpy() == RESULT_SAT
+    unsat = data.result.to_numpy() == RESULT_UNSAT
+    num_check_sat = None
+
+    if g_args.track == OPT_TRACK_INC:
+        counts = rng.integers(1, 200, len(benchmarks))
+        num_check_sat = pandas.DataFrame({
+            'benchmark': benchmarks.benchmark,
+            'num_check_sat': counts,
+        })
+        total = counts[data.pop('benchmark_index').to_numpy()]
+        answered = numpy.where(
+                solved, total, (total * rng.random(n)).astype(int))
+        wrong = numpy.where(rng.random(n) < g_args.error_rate, 1, 0)
+        wrong = numpy.minimum(wrong, answered)
+        data['result'] = '-'
+        data = data.drop(columns=['expected'])
+        data['wrong-answers'] = wrong
+        data['correct-answers'] = answered - wrong
+        data['solver-cpu-time'] = (data['cpu time'] * 0.9).round(3)
+        data['solver-wall-time'] = (data['wallclock time'] * 0.9).round(3)
+        return data, num_check_sat
+
+    data = data.drop(columns=['benchmark_index'])
+    if g_args.track == OPT_TRACK_UC:
+        # Only unsat answers produce unsat cores.
+        erroneous = unsat & (rng.random(n) < g_args.error_rate)
+        data['result-is-erroneous'] = erroneous.astype(int)
+        data['reduction'] = numpy.where(
+                unsat & ~erroneous, rng.integers(0, 1000, n), 0)
+    elif g_args.track == OPT_TRACK_MV:
+        invalid = sat & (rng.random(n) < g_args.error_rate)
+        data['model_validator_status'] = numpy.where(
+                sat, numpy.where(invalid, 'INVALID', 'VALID'), 'UNKNOWN')
+        data['model_validator_error'] = numpy.where(
+                invalid, 'invalid_model', '-')
+        data['model_validator_exception'] = '-'
+    elif g_args.track == OPT_TRACK_PE:
+        invalid = unsat & (rng.random(n) < g_args.error_rate)
+        data['reason'] = numpy.where(
+                unsat, numpy.where(invalid, 'invalid', 'valid'), '-')
+    return data, num_check_sat
+
+
+# Write the solvers csv in the format expected by option -S of score.py.
+def write_solvers_csv(solvers, path):
+    global g_args
+    columns = {
+        'Solver ID': solvers['solver id'],
+        'Solver Name': solvers.solver,
+        'Variant Of': '',
+        'Competing': numpy.where(solvers.competing, 'yes', 'no'),
+    }
+    for track, column in g_config_id_columns.items():
+        columns[column] = solvers['configuration id'] \
+                if track == g_args.track else ''
+    pandas.DataFrame(columns).to_csv(path, index=False)
+
+
+def parse_args():
+    global g_args
+    parser = ArgumentParser(
+            description="Generate synthetic StarExec results of a track")
+    parser.add_argument("-o", "--outdir",
+                        required=True,
+                        help="directory for the generated files "\
+                             "(results.csv, solvers.csv and, for the "\
+                             "incremental track, num_check_sat.csv)")
+    parser.add_argument("-T", "--track",
+                        default=OPT_TRACK_SQ,
+                        choices=[OPT_TRACK_SQ, OPT_TRACK_INC, OPT_TRACK_UC,
+                                 OPT_TRACK_MV, OPT_TRACK_PE],
+                        help="the track of the generated results")
+    parser.add_argument("--divisions",
+                        type=int,
+                        default=10,
+                        help="number of divisions")
+    parser.add_argument("--benchmarks",
+                        type=int,
+                        default=1000,
+                        help="number of benchmarks per division")
+    parser.add_argument("--families",
+                        type=int,
+                        default=20,
+                        help="number of (top-most) families per division")
+    parser.add_argument("--solvers",
+                        type=int,
+                        default=10,
+                        help="number of solvers")
+    parser.add_argument("--participation",
+                        type=float,
+                        default=0.7,
+                        help="probability that a solver participates in a "\
+                             "division")
+    parser.add_argument("--noncompetitive-rate",
+                        type=float,
+                        default=0.2,
+                        help="fraction of non-competitive solvers")
+    parser.add_argument("--unknown-rate",
+                        type=float,
+                        default=0.1,
+                        help="fraction of benchmarks with status unknown")
+    parser.add_argument("--disagreement-rate",
+                        type=float,
+                        default=0.01,
+                        help="fraction of benchmarks with status unknown on "\
+                             "which solvers disagree")
+    parser.add_argument("--error-rate",
+                        type=float,
+                        default=0.001,
+                        help="probability of a wrong answer of a job pair")
+    parser.add_argument("--memout-rate",
+                        type=float,
+                        default=0.05,
+                        help="probability of a memout of an unsolved job pair")
+    parser.add_argument("-t", "--time",
+                        type=int,
+                        default=1200,
+                        help="time limit of the job pairs")
+    parser.add_argument("--seed",
+                        type=int,
+                        default=0,
+                        help="seed of the random number generator")
+    g_args = parser.parse_args()
+    if g_args.solvers < 2:
+        die("At least two solvers are required")
+
+
+def main():
+    global g_args
+    parse_args()
+    rng = numpy.random.default_rng(g_args.seed)
+
+    benchmarks = gen_benchmarks(rng)
+    solvers = gen_solvers(rng)
+    data, solved, s, b = gen_job_pairs(rng, benchmarks, solvers)
+    data['benchmark_index'] = b
+    data, num_check_sat = add_track_columns(rng, data, solved, benchmarks)
+
+    if not os.path.exists(g_args.outdir):
+        os.makedirs(g_args.outdir)
+    data.to_csv(os.path.join(g_args.outdir, 'results.csv'), index=False)
+    write_solvers_csv(solvers, os.path.join(g_args.outdir, 'solvers.csv'))
+    if num_check_sat is not None:
+        num_check_sat.to_csv(os.path.join(g_args.outdir, 'num_check_sat.csv'),
+                             index=False)
+    print("Generated {} job pairs of {} solvers on {} benchmarks in {}".format(
+        len(data), len(solvers), len(benchmarks), g_args.outdir))
+
+
+if __name__ == "__main__":
+    main()
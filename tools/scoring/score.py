@@ -21,6 +21,8 @@ pandas.set_option('display.precision', 16)
 # Options parsing
 from argparse import ArgumentParser
 
+import concurrent.futures
+import cProfile
 import json
 import os
 import sys
@@ -28,6 +30,10 @@ import csv
 import math
 import time
 import datetime
+import hashlib
+import itertools
+import multiprocessing
+import pickle
 
 # StarExec result strings
 RESULT_UNKNOWN = 'starexec-unknown'
@@ -85,9 +91,25 @@ EXT_PARALLEL = "-parallel.md"
 
 g_args = None
 
-g_competitive = {}
-g_solver_names = {}
-g_solver_variants = {}
+# Data shared with the worker processes of option --jobs.
+g_pool_data = None
+
+# Measurements of the stages of a run (option --profile), see end_stage.
+g_profile_stages = []
+
+# Data read from input files that is kept in memory between the runs of a
+# scoring server (see score_server.py), maps the key of an input file (see
+# get_memo_key) to the data read from it. None if no data is kept.
+g_memo = None
+
+# Divisions of the track in the divisions map (option --divisions-map), see
+# get_track_divisions.
+g_track_divisions = None
+
+# Solver registry, maps solver and configuration ids (index) to the solver
+# name ('name'), the name of the solver it is a variant of ('variant') and
+# whether it is competitive ('competitive'), see read_solvers_csv.
+g_solvers = None
 
 g_tracks = { OPT_TRACK_SQ: TRACK_SQ,
              OPT_TRACK_INC: TRACK_INC,
@@ -125,56 +147,191 @@ def die(msg):
 def log(string):
     print("[score] {}".format(string))
 
-# Split a benchmark string into benchmark, division and family.
-def split_benchmark_division_family(x, family_func):
-    assert len(x) == 2, "weird x: {0}".format(x)
-    division, benchmark = x[0], x[1]
-    # Check if division is a logic string.
+# Get the key of an input file in g_memo. The key changes if the file is
+# modified, 'args' are the options the data read from the file depends on.
+def get_memo_key(path, *args):
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_size, stat.st_mtime_ns) + args
+
+# Keep the data read from an input file in g_memo under the given key (see
+# get_memo_key). The data read from earlier versions of the file with the
+# same options is dropped, such that g_memo only grows with the number of
+# distinct input files.
+def set_memo(memo_key, data):
+    global g_memo
+    stale = [key for key in g_memo
+             if key[0] == memo_key[0] and key[3:] == memo_key[3:]]
+    for key in stale:
+        del g_memo[key]
+    g_memo[memo_key] = data
+
+# Reset the state that is kept in global variables during a run, such that
+# the runs of a scoring server (see score_server.py) are independent.
+def reset_run_state():
+    global allLogics, divisionInfo, g_report_scores, g_profile_stages
+    global g_track_divisions
+    allLogics = set()
+    divisionInfo = {}
+    g_report_scores = {}
+    g_profile_stages = []
+    g_track_divisions = None
+
+# Get the peak resident set size of the process in MB.
+# Note: Module resource is not available on Windows and only imported with
+#       option --profile.
+def get_peak_rss():
+    import resource
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports the peak resident set size in KB, macOS in bytes.
+    if sys.platform == 'darwin':
+        return peak_rss / (1024 * 1024)
+    return peak_rss / 1024
+
+# Start measuring a stage of a run (option --profile).
+#
+# returns: the start times to pass to end_stage, or None if option --profile
+#          is not given
+def start_stage():
+    global g_args
+    if not g_args.profile:
+        return None
+    return (time.perf_counter(), time.process_time())
+
+# Finish measuring a stage of a run and record its wall time, CPU time, the
+# peak resident set size of the process after the stage and, if 'data' is
+# given, the number of rows of the data produced by the stage.
+#
+# start: the start times as returned by start_stage
+# stage: the name of the stage
+# info : additional fields of the record, e.g., the division, or the number
+#        of 'rows' of a stage that does not produce a dataframe
+def end_stage(start, stage, data=None, **info):
+    global g_profile_stages
+    if start is None:
+        return
+    record = {'stage': stage,
+              'wall_time': time.perf_counter() - start[0],
+              'cpu_time': time.process_time() - start[1],
+              'peak_rss_mb': get_peak_rss(),
+              'rows': None if data is None else len(data),
+              'pid': os.getpid()}
+    record.update(info)
+    g_profile_stages.append(record)
+
+# Write the stage measurements of option --profile to a json file. Besides
+# the list of all measured stages, the file contains the wall time, CPU time
+# and number of occurrences of each stage summed over the run.
+#
+# start: the start times of the run as returned by start_stage
+def write_profile(start, path):
+    global g_profile_stages
+    summary = {}
+    for record in g_profile_stages:
+        s = summary.setdefault(record['stage'],
+                               {'count': 0, 'wall_time': 0, 'cpu_time': 0})
+        s['count'] += 1
+        s['wall_time'] += record['wall_time']
+        s['cpu_time'] += record['cpu_time']
+    profile = {'argv': sys.argv,
+               'wall_time': time.perf_counter() - start[0],
+               'cpu_time': time.process_time() - start[1],
+               'peak_rss_mb': get_peak_rss(),
+               'summary': summary,
+               'stages': g_profile_stages}
+    with open(path, 'w') as outfile:
+        json.dump(profile, outfile, indent=2, default=str)
+    log('Wrote profile to {}'.format(path))
+
+# Split benchmark strings into division and benchmark.
+# Note: 'benchmarks' is a series of unique benchmark strings, which are
+#       prefixed with the division name and optionally the space name.
+def split_benchmark_division(benchmarks):
+    split = benchmarks.str.split('/', n=1, expand=True)
+    assert split.shape[1] == 2 and split[1].notna().all(), \
+            "weird benchmarks: {0}".format(
+                    benchmarks[split[1].isna()].tolist() if split.shape[1] == 2
+                    else benchmarks.tolist())
+    division, benchmark = split[0], split[1]
+    # Check if division is a logic string, else strip the space name.
     # Note: This assumes that space names are not in upper case.
-    if not division.isupper():
-        division, benchmark = benchmark.split('/', 1)
-    family = family_func(benchmark)
-    return benchmark, division, family
+    spaced = ~division.str.isupper()
+    if spaced.any():
+        split = benchmark[spaced].str.split('/', n=1, expand=True)
+        division = division.where(~spaced, split[0])
+        benchmark = benchmark.where(~spaced, split[1])
+    return division, benchmark
 
 # Determine the top-most directory as benchmark family.
-# Note: 'benchmark' is not prefixed with the division name.
-def get_family_top(benchmark):
-    return benchmark.split('/', 1)[0]
+# Note: 'benchmarks' is a series of benchmark strings, which are not prefixed
+#       with the division name.
+def get_family_top(benchmarks):
+    return benchmarks.str.split('/', n=1).str[0]
 
 # Determine the bottom-most directory as benchmark family.
-# Note: 'benchmark' is not prefixed with the division name.
-def get_family_bot(benchmark):
-    return benchmark.rsplit('/', 1)[0]
+# Note: 'benchmarks' is a series of benchmark strings, which are not prefixed
+#       with the division name.
+def get_family_bot(benchmarks):
+    return benchmarks.str.rsplit('/', n=1).str[0]
+
+# Select family extraction function.
+# This depends on the family_definition option:
+#   - 'top' interprets the top-most directory, and
+#   - 'bot' interprets the bottom-most directory
+# as benchmark family.
+# The rules have always specified 'top' but the scoring scripts for many
+# years actually implemented 'bot'. The scripts allow you to choose.
+def get_family_function(family_definition):
+    if family_definition == 'top':
+        return get_family_top
+    elif family_definition == 'bot':
+        return get_family_bot
+    die('Family option not supported: {}'.format(family_definition))
 
 # Add columns for division and family.
 # Also does some tidying of benchmark column for specific years of the
 # competition. Edit this function if you want to edit how families are added.
+# Benchmark strings repeat once per solver, hence every distinct benchmark
+# string is split only once and the result is broadcast back to all job pairs.
 def add_division_family_info(data, family_definition):
-    # Select family extraction functions.
-    # This depends on the family_definition option:
-    #   - 'top' interprets the top-most directory, and
-    #   - 'bot' interprets the bottom-most directory
-    # as benchmark family.
-    # The rules have always specified 'top' but the scoring scripts for many
-    # years actually implemented 'bot'. The scripts allow you to choose.
-    fam_func = None
-    if family_definition == 'top':
-        fam_func = get_family_top
-    elif family_definition == 'bot':
-        fam_func = get_family_bot
-    else:
-        die('Family option not supported: {}'.format(family_definition))
-
-    split = data['benchmark'].str.split('/', n=1)
-    split = split.map(lambda x: split_benchmark_division_family(x, fam_func))
-    data['benchmark'] = split.str[0]
-    data['division'] = split.str[1]
-    data['family'] = split.str[2]
+    fam_func = get_family_function(family_definition)
+
+    codes, uniques = pandas.factorize(data['benchmark'])
+    assert (codes >= 0).all(), "missing benchmark"
+    divisions, benchmarks = split_benchmark_division(pandas.Series(uniques))
+    families = fam_func(benchmarks)
+    data['benchmark'] = benchmarks.to_numpy()[codes]
+    data['division'] = divisions.to_numpy()[codes]
+    data['family'] = families.to_numpy()[codes]
     return data
 
-# Drop any rows that contain benchmarks with status unknown where two otherwise
-# sound solvers disagree on the result.
-def remove_disagreements(data):
+# Write the disagreements report as computed by remove_disagreements to a
+# file. The report is written as a Markdown table if the file name ends with
+# '.md' (with '|' escaped in the cells), and as CSV otherwise.
+#
+# report: A dataframe with one row per disagreeing benchmark and sound solver
+#         with a sat/unsat result, and columns
+#         'division', 'benchmark', 'solver', 'result' and 'cpu_time'.
+def write_disagreements_report(report, path):
+    log('Write disagreements to {}'.format(path))
+    if not path.endswith('.md'):
+        report.to_csv(path_or_buf=path, index=False)
+        return
+    columns = ['division', 'benchmark', 'solver', 'result', 'cpu_time']
+    lines = ['| {} |'.format(' | '.join(columns)),
+             '|{}'.format('---|' * len(columns))]
+    for row in report[columns].itertuples(index=False):
+        lines.append('| {} |'.format(
+            ' | '.join(str(x).replace('|', '\\|') for x in row)))
+    with open(path, 'w') as outfile:
+        outfile.write('\n'.join(lines) + '\n')
+
+# Determine the benchmarks with status unknown where two otherwise sound
+# solvers disagree on the result.
+#
+# year   : the string identifying the year of the results (used for the name
+#          of the disagreements report, see option --disagreements)
+# returns: the set of disagreeing benchmarks
+def get_disagreements(data, year=''):
     global g_args
 
     # First find and filter out unsound solvers, i.e., solvers that disagree
@@ -196,7 +353,7 @@ def remove_disagreements(data):
 
     # Group by division + benchmarks and count the number of results. It's
     # necessary to group by division as well as family+name can give duplicates
-    grouped_results = solved_unknown.groupby(['division', 'benchmark'], as_index=False).agg(
+    grouped_results = solved_unknown.groupby(['division', 'benchmark'], as_index=False, observed=True).agg(
                             {'result': 'count'})
 
     # If the number of results is more than one, we have disagreeing solvers,
@@ -206,97 +363,189 @@ def remove_disagreements(data):
 
     exclude = list(zip(disagreements['division'], disagreements['benchmark']))
 
+    if g_args.log or g_args.disagreements:
+        # Collect the sat/unsat results of sound solvers on the disagreeing
+        # benchmarks in one pass and index them by benchmark.
+        # Note: Benchmarks with the same name in other divisions are
+        #       included here, the report only keeps the results on the
+        #       disagreeing benchmark of a division.
+        details = data[(data.benchmark.isin(set(disagreements.benchmark)))
+                       & (~data.solver.isin(unsound_solvers))
+                       & ((data.result == RESULT_SAT)
+                           | (data.result == RESULT_UNSAT))]
+        details = details[
+                ["division", "benchmark", "solver", "result", "cpu_time"]]
+        details_per_benchmark = dict(
+                (b, bdata) for b, bdata in details.groupby(
+                    "benchmark", observed=True, sort=False))
+
     if g_args.log:
         log('Found {} disagreements:'.format(len(exclude)))
         i = 1
         for d, b in exclude:
             log('[{}] {}/{}'.format(i, d, b))
-            bad_solvers = data[(data.benchmark == b) & (~data.solver.isin(unsound_solvers))
-                          & ((data.result == RESULT_SAT)
-                              | (data.result == RESULT_UNSAT))]
+            bad_solvers = details_per_benchmark[b]
             print(bad_solvers[["solver", "result", "cpu_time"]].to_string(header=None, index=False))
             i += 1
 
+    if g_args.disagreements:
+        report = disagreements[['division', 'benchmark']].merge(
+                details, on=['division', 'benchmark'], how='left')
+        write_disagreements_report(
+                report, g_args.disagreements.replace('{year}', str(year)))
+
+    return set(disagreements.benchmark)
+
+# Drop any rows that contain benchmarks with status unknown where two otherwise
+# sound solvers disagree on the result.
+#
+# year: the string identifying the year of the results (used for the name of
+#       the disagreements report, see option --disagreements)
+def remove_disagreements(data, year=''):
     # Exclude benchmarks on which solvers disagree.
-    data = data[~(data.benchmark.isin(set(disagreements.benchmark)))]
+    stage = start_stage()
+    disagreements = get_disagreements(data, year)
+    data = data[~(data.benchmark.isin(disagreements))]
+    end_stage(stage, 'disagreements', data, year=year)
     return data
 
-# Return true if the solver with given id is competitive.
-def is_competitive_solver(solver_config_id):
-    global g_competitive
-    return g_competitive[solver_config_id]
+# Get the positions of the given solver ids in the solver registry.
+#
+# solver_ids: an array or series of solver ids
+# returns   : an array of positions in g_solvers, -1 for unknown ids
+def get_solver_positions(solver_ids):
+    global g_solvers
+    return g_solvers.index.get_indexer(solver_ids)
+
+# Return a boolean array that is true for the ids of competitive solvers.
+# Raises a KeyError for the first unknown solver id.
+def are_competitive_solvers(solver_ids):
+    global g_solvers
+    positions = get_solver_positions(solver_ids)
+    if (positions < 0).any():
+        raise KeyError(numpy.asarray(solver_ids)[positions < 0][0])
+    return g_solvers['competitive'].to_numpy()[positions]
 
 # Return solver name of solver with given solver id.
 def get_solver_name(solver_id):
-    global g_solver_names
-    return g_solver_names.get(solver_id, solver_id)
-
-# Return solver variant name of solver with given solver id.
-def get_solver_variant(solver_id):
-    global g_solver_variants
-    name = g_solver_variants.get(solver_id, solver_id)
-    if not g_competitive[solver_id]:
-        return '[{}]'.format(name)
-    return name
-
-# Do not consider solver variants for determining if a division is
-# competitive.
-# Uses get_solver_name(solver) to get the base version of solver.
-def is_competitive_division(solvers):
-    return len(set([get_solver_name(x) for x in solvers])) > 1
+    global g_solvers
+    return g_solvers['name'].get(solver_id, solver_id)
+
+# Return the solver names for an array or series of solver ids, unknown ids
+# are mapped to themselves (as get_solver_name).
+def get_solver_names(solver_ids):
+    global g_solvers
+    positions = get_solver_positions(solver_ids)
+    return numpy.where(positions >= 0,
+                       g_solvers['name'].to_numpy()[positions],
+                       numpy.asarray(solver_ids, dtype=object))
+
+# Return the solver variant names for an array or series of solver ids.
+# Non-competitive solvers are put in brackets, unknown solver ids raise a
+# KeyError (see are_competitive_solvers).
+def get_solver_variants(solver_ids):
+    global g_solvers
+    competitive = are_competitive_solvers(solver_ids)
+    positions = get_solver_positions(solver_ids)
+    variants = g_solvers['variant'].to_numpy()[positions]
+    return numpy.where(competitive,
+                       variants,
+                       ['[{}]'.format(name) for name in variants])
 
 # Compute family score modifiers.
 # This is based on the presentation in the SMT-COMP 2017 rules document
 # and is basically the same in all rules documents.
-def get_family_scores(data):
+# The number of benchmarks of each family is counted on the distinct pairs of
+# family and benchmark category codes.
+#
+# returns: an array with the normalized weight alpha_prime_b of each family
+#          indexed by the category code of the family, the last entry is
+#          used for missing families (code -1) and is 1 (as for families
+#          that do not occur in 'data')
+def get_family_weights(data):
+    num_families = len(data.family.cat.categories)
+    weights = numpy.ones(num_families + 1)
     if data.empty:
-        return {}
-
-    raw_fam_scores = {} # The 'raw' score is alpha_b for b in the family.
-    score_sum = 0       # The sum in the definition of alpha_b_prime.
-
-    for family, fdata in data.groupby('family'):
-        Fb = len(fdata.benchmark.unique())
-        alpha_b = (1.0 + math.log(Fb)) / Fb
-        raw_fam_scores[family] = alpha_b
-        score_sum += Fb * alpha_b
+        return weights
+
+    family_codes = data.family.cat.codes.to_numpy().astype(numpy.int64)
+    benchmark_codes = data.benchmark.cat.codes.to_numpy()
+    num_benchmarks = len(data.benchmark.cat.categories)
+    known = family_codes >= 0
+    pairs = pandas.unique(family_codes[known] * num_benchmarks
+                          + benchmark_codes[known])
+    Fb = numpy.bincount(pairs // num_benchmarks, minlength=num_families)
+    families = numpy.flatnonzero(Fb)
+    Fb = Fb[families]
+
+    # The 'raw' score is alpha_b for b in the family.
+    # Note: math.log is applied to the distinct family sizes since numpy.log
+    #       may differ in the last digit.
+    sizes, inverse = numpy.unique(Fb, return_inverse=True)
+    alpha_b = numpy.array([(1.0 + math.log(n)) / n for n in sizes])[inverse]
+    # The sum in the definition of alpha_b_prime, summed up in the order of
+    # the families.
+    score_sum = numpy.cumsum(Fb * alpha_b)[-1]
 
     # Compute normalized weight alpha_prime_b for each benchmark family.
-    family_scores = dict((family, alpha_b / score_sum)
-                            for family, alpha_b in raw_fam_scores.items())
-
-    return family_scores
-
-# Helper to add mapping of solver id to solver name and solver variant id and
-# to g_solver_names and g_solver_variants.
-def map_solver_id(row, column):
-    global g_competitive, g_solver_names, g_solver_variants
-    if column not in row:
-        return
-    solver_id_str = row[column]
-    solver_id = int(solver_id_str) if isinstance(solver_id_str, int) or solver_id_str.isnumeric() else None
-    if solver_id:
-        g_competitive[solver_id] = row[COL_COMPETING] == 'yes'
-        g_solver_names[solver_id] = row[COL_SOLVER_NAME]
-        g_solver_variants[solver_id] = row[COL_VARIANT_OF_ID] \
-                if row[COL_VARIANT_OF_ID] else row[COL_SOLVER_NAME]
-
-# Read csv mapping solver id to solver name and solver variant.
+    weights[families] = alpha_b / score_sum
+    return weights
+
+# Columns of the solvers csv with solver and configuration ids. If an id
+# occurs more than once, the last occurrence (by row, then by column in this
+# order) is used.
+g_solver_id_columns = [COL_SOLVER_ID,
+                       COL_SOLVER_ID_SQ_2019,
+                       COL_SOLVER_ID_INC_2019,
+                       COL_SOLVER_ID_UC_2019,
+                       COL_SOLVER_ID_MV_2019,
+                       COL_CONFIG_ID_SQ,
+                       COL_CONFIG_ID_INC,
+                       COL_CONFIG_ID_UC,
+                       COL_CONFIG_ID_MV,
+                       COL_CONFIG_ID_PE]
+
+# Read csv mapping solver id to solver name and solver variant into the
+# solver registry g_solvers.
+# The id columns are melted into one (row, id) table. Ids are the values of
+# integer columns and the numeric strings of other columns, zero ids are
+# ignored.
 def read_solvers_csv():
-    global g_args, g_solver_names, g_solver_variants, g_competitive
+    global g_args, g_solvers, g_memo
+    memo_key = None
+    if g_memo is not None:
+        memo_key = get_memo_key(g_args.solvers, 'solvers')
+        if memo_key in g_memo:
+            g_solvers = g_memo[memo_key]
+            return
+
     data = pandas.read_csv(g_args.solvers, keep_default_na=False)
-    for index, row in data.iterrows():
-        assert not pandas.isnull(row[COL_SOLVER_ID])
-        map_solver_id(row, COL_SOLVER_ID)
-        map_solver_id(row, COL_SOLVER_ID_SQ_2019)
-        map_solver_id(row, COL_SOLVER_ID_INC_2019)
-        map_solver_id(row, COL_SOLVER_ID_UC_2019)
-        map_solver_id(row, COL_SOLVER_ID_MV_2019)
-        map_solver_id(row, COL_CONFIG_ID_SQ)
-        map_solver_id(row, COL_CONFIG_ID_INC)
-        map_solver_id(row, COL_CONFIG_ID_UC)
-        map_solver_id(row, COL_CONFIG_ID_MV)
-        map_solver_id(row, COL_CONFIG_ID_PE)
+    assert not data[COL_SOLVER_ID].isnull().any()
+
+    columns = [c for c in g_solver_id_columns if c in data.columns]
+    ids = pandas.DataFrame(index=data.index)
+    for column in columns:
+        values = data[column]
+        if not pandas.api.types.is_integer_dtype(values.dtype):
+            values = values.where(values.astype(str).str.isnumeric())
+        ids[column] = values.astype('Int64')
+    ids = ids.reset_index(names='row').melt(
+            id_vars='row', var_name='column', value_name='id').dropna()
+    ids = ids.assign(order=ids.column.map(columns.index))
+    ids = ids[ids.id != 0]\
+            .sort_values(['row', 'order'])\
+            .drop_duplicates('id', keep='last')
+
+    rows = data.iloc[ids.row.to_numpy()]
+    names = rows[COL_SOLVER_NAME].to_numpy(dtype=object)
+    variants = rows[COL_VARIANT_OF_ID].to_numpy(dtype=object)
+    g_solvers = pandas.DataFrame(
+            {'name': names,
+             'variant': numpy.where(variants.astype(bool), variants, names),
+             'competitive': (rows[COL_COMPETING] == 'yes').to_numpy()},
+            index=pandas.Index(ids.id.to_numpy(dtype=int), name='solver_id'))
+    if memo_key:
+        set_memo(memo_key, g_solvers)
 
 
 ###############################################################################
@@ -312,11 +561,22 @@ def read_solvers_csv():
 # data       : The data to be processed as computed by the score function.
 # sequential : Compute sequential results if true, else parallel.
 def group_and_rank_solvers(data, sequential):
+    stage = start_stage()
+    res = rank_solvers(group_solvers(data), sequential)
+    end_stage(stage, 'group_and_rank_solvers', res)
+    return res
+
+# Groups the results in 'data' computed by the score function by year,
+# division and solver (see group_and_rank_solvers).
+# Note: The groups of different years are independent, i.e., the grouped
+#       results of several years can be concatenated before ranking them.
+def group_solvers(data):
     global g_args
 
     # Group results
     if 'num_check_sat' in data.columns:
-      data_grouped = data.groupby(['year', 'division', 'solver_id', 'configuration_id']).agg({
+      data_grouped = data.groupby(['year', 'division', 'solver_id', 'configuration_id'],
+                                 observed=True).agg({
           'correct': sum,
           'error': sum,
           'correct_sat' : sum,
@@ -333,7 +593,8 @@ def group_and_rank_solvers(data, sequential):
           'num_check_sat': sum,
           })
     else:
-      data_grouped = data.groupby(['year', 'division', 'solver_id', 'configuration_id']).agg({
+      data_grouped = data.groupby(['year', 'division', 'solver_id', 'configuration_id'],
+                                 observed=True).agg({
           'correct': sum,
           'error': sum,
           'correct_sat' : sum,
@@ -348,11 +609,19 @@ def group_and_rank_solvers(data, sequential):
           'competitive': 'first',
           'division_size': 'first',
           })
+    return data_grouped
 
-
+# Ranks the solvers in each division of the results grouped by group_solvers
+# (see group_and_rank_solvers).
+#
+# data_grouped : The data as grouped by group_solvers.
+# sequential   : Compute sequential results if true, else parallel.
+def rank_solvers(data_grouped, sequential):
+    global g_args
 
     # Convert solver index to column
-    data_grouped.reset_index(level=['solver_id', 'configuration_id'], inplace=True)
+    data_grouped = data_grouped.reset_index(
+            level=['solver_id', 'configuration_id'])
 
     # Sort solvers by sort_columns and sort_asc within a division
     sort_columns = ['score_error', 'score_correct']
@@ -369,23 +638,24 @@ def group_and_rank_solvers(data, sequential):
     # Rank solvers in each division starting from rank 1. Note that competitive
     # solvers cannot get awarded a rank and merely get the current rank without
     # increasing it.
+    # The rank of a solver is 1 + the number of competitive solvers ranked
+    # before it in its (year, division) group.
     # Note: If there are consecutive non-competitive solvers, their ranking
     #       won't be correct (since the rank won't be incremented).
-    ranks = []
-    seen = set()
-    rank = 1
-    for year_division, row in data_sorted.iterrows():
-        if year_division not in seen:
-            rank = 1
-            seen.add(year_division)
-        ranks.append(rank)
-        if row.competitive:
-            rank += 1
-    data_sorted['rank'] = ranks
+    competitive = data_sorted['competitive'].astype(int)
+    data_sorted['rank'] = \
+        competitive.groupby(level=[0,1], sort=False, observed=True).cumsum() - competitive + 1
 
     return data_sorted
 
 
+# Return the code of 'value' in the categories of the categorical 'column',
+# or -2 if 'value' is not a category (which then matches no code, not even
+# the code -1 of missing values).
+def get_category_code(column, value):
+    categories = column.cat.categories
+    return categories.get_loc(value) if value in categories else -2
+
 # Main scoring function that allows it to capture different scoring schemes.
 # division       : the division to compute the scores for
 # data           : the results data of this division
@@ -394,8 +664,15 @@ def group_and_rank_solvers(data, sequential):
 # filter_result  : - None: consider all instances
 #                  - RESULT_SAT: consider only satisfiable instances
 #                  - RESULT_UNSAT: consider only unsatisfiable instances
+#                  (the instances are filtered from the scores of all
+#                  instances, see filter_scores)
 # use_families   : use weighted scoring scheme (as used from 2016-2018)
 # skip_unknowns  : skip benchmarks with status unknown (as done prior to 2017)
+#
+# Note: The columns of the scored data are computed as NumPy arrays (indexed
+#       by position in 'data') and the data frame is created once from these
+#       arrays. The categorical columns 'status', 'result' and 'expected'
+#       (see set_results_dtypes) are handled via their category codes.
 def score(division,
           data,
           wclock_limit,
@@ -406,6 +683,19 @@ def score(division,
           sequential):
     global g_args
     assert not filter_result or filter_result in [RESULT_SAT, RESULT_UNSAT]
+    assert data.result.dtype == data.expected.dtype
+
+    if filter_result:
+        return filter_scores(score(division,
+                                   data,
+                                   wclock_limit,
+                                   None,
+                                   year,
+                                   use_families,
+                                   skip_unknowns,
+                                   sequential),
+                             filter_result,
+                             year)
 
     if g_args.log: log("Score for {} in {}".format(year, division))
 
@@ -413,43 +703,42 @@ def score(division,
     if g_args.log: log("Computing scores for {}".format(division))
     if g_args.log: log("... with {} benchmarks".format(num_benchmarks))
 
-    family_scores = get_family_scores(data) if use_families else {}
+    num_rows = len(data)
+    cpu_time = data.cpu_time.to_numpy(copy=True)
+    wallclock_time = data.wallclock_time.to_numpy(copy=True)
+    status = data.status.cat.codes.to_numpy(copy=True)
+    result = data.result.cat.codes.to_numpy(copy=True)
+    expected = data.expected.cat.codes.to_numpy()
 
-    # Create new dataframe with relevant columns and populate new columns
-    data_new = data[['division', 'benchmark', 'family', 'solver', 'solver_id',
-                     'cpu_time', 'wallclock_time', 'status', 'result',
-                     'expected']].copy()
-    if int(year) >= 2022:
-        data_new['solver_id'] = data['configuration_id']
-    data_new['year'] = year
-    data_new['correct'] = 0       # Number of correctly solved benchmarks
-    data_new['error'] = 0         # Number of wrong results
-    data_new['correct_sat'] = 0   # Number of correctly solved sat benchmarks
-    data_new['correct_unsat'] = 0 # Number of correctly solved unsat benchmarks
-    data_new['division_size'] = num_benchmarks
-    data_new['competitive'] = data_new.solver_id.map(is_competitive_solver)
-    data_new['timeout'] = 0
-    data_new['memout'] = 0
-    data_new['unsolved'] = 0
-    data_new['configuration_id'] = data['configuration_id']
+    code_memout = get_category_code(data.status, 'memout')
+    code_timeout = get_category_code(data.status, 'timeout')
+    code_unknown = get_category_code(data.result, RESULT_UNKNOWN)
+    code_sat = get_category_code(data.result, RESULT_SAT)
+    code_unsat = get_category_code(data.result, RESULT_UNSAT)
+    assert code_timeout >= 0 and code_unknown >= 0
 
     # Set the column that is used to determine if a benchmark was solved
     # within the time limit.
-    time_column = 'cpu_time' if sequential else 'wallclock_time'
+    time_column = cpu_time if sequential else wallclock_time
 
     # Set penalty of 'wclock_limit' seconds for jobs with memouts.
-    data_new.loc[data_new.status == 'memout',
-                 ['cpu_time', 'wallclock_time']] = [wclock_limit, wclock_limit]
+    memout = status == code_memout
+    cpu_time[memout] = wclock_limit
+    wallclock_time[memout] = wclock_limit
 
     # Reset cpu_time/wallclock_time/status/result if wclock_limit is exceeded.
     # This can happen e.g., for the 24s scoring.
-    data_new.loc[data_new[time_column] > wclock_limit,
-                 ['cpu_time', 'wallclock_time', 'status', 'result']] = \
-                    [wclock_limit, wclock_limit, 'timeout', RESULT_UNKNOWN]
+    exceeded = time_column > wclock_limit
+    cpu_time[exceeded] = wclock_limit
+    wallclock_time[exceeded] = wclock_limit
+    status[exceeded] = code_timeout
+    result[exceeded] = code_unknown
 
     # Determine memouts/timeouts based on status.
-    data_new.loc[data_new.status.str.startswith('timeout'), 'timeout'] = 1
-    data_new.loc[data_new.status == 'memout', 'memout'] = 1
+    codes_timeout = numpy.flatnonzero(
+            data.status.cat.categories.str.startswith('timeout'))
+    timeout = numpy.isin(status, codes_timeout).astype(int)
+    memout = (status == code_memout).astype(int)
 
     # Column 'wrong-answers' only exists in incremental tracks.
     incremental = 'wrong-answers' in data.columns
@@ -463,100 +752,65 @@ def score(division,
     
     # Column 'model_validator_status' only exists in the model validation track.
     model_validation = 'model_validator_status' in data.columns
-    if model_validation:
-        data_new['model_validator_status'] = data['model_validator_status']
-        data_new['model_validator_error'] = data['model_validator_error']
-        if int(year) == 2020:
-            data_new['model_validator_exception'] = data['model_validator_exception']
     # Column 'reason' only exists in proof exhibition track.
     proof_exhibition = 'reason' in data.columns
-    if proof_exhibition:
-        data_new['reason'] = data['reason']
 
-    # Set alpha_prime_b for each benchmark, set to 1 if family is not in the
-    # 'family_scores' dictionary (use_families == False).
-    data_new['alpha_prime_b'] = \
-        data_new.family.map(lambda x: family_scores.get(x, 1))
+    # Set alpha_prime_b for each benchmark, set to 1 if use_families == False.
+    if use_families:
+        alpha_prime_b = \
+            get_family_weights(data)[data.family.cat.codes.to_numpy()]
+    else:
+        alpha_prime_b = numpy.ones(num_rows)
 
     if use_families:
-        data_new['score_modifier'] = \
-            data_new.alpha_prime_b * data_new.division_size
+        score_modifier = alpha_prime_b * num_benchmarks
     else:
-        data_new['score_modifier'] = 1
+        score_modifier = numpy.int64(1)
+
+    correct = numpy.zeros(num_rows, dtype=int)       # Number of correctly
+                                                     # solved benchmarks
+    error = numpy.zeros(num_rows, dtype=int)         # Number of wrong results
+    correct_sat = numpy.zeros(num_rows, dtype=int)   # Number of correctly
+                                                     # solved sat benchmarks
+    correct_unsat = numpy.zeros(num_rows, dtype=int) # Number of correctly
+                                                     # solved unsat benchmarks
+    unsolved = numpy.zeros(num_rows, dtype=int)
+    score_times = None
 
     # Note: For incremental tracks we have to consider all benchmarks (also
     #       the ones that run into resource limits).
     if incremental:
-        data_new['correct'] = data['correct-answers']
-        data_new['error'] = data['wrong-answers']
-        data_new['num_check_sat'] = data['num_check_sat']
-        data_new['unsolved'] = data_new.num_check_sat - data_new.correct
+        correct = data['correct-answers'].to_numpy()
+        error = data['wrong-answers'].to_numpy()
+        num_check_sat = data['num_check_sat'].to_numpy()
+        unsolved = num_check_sat - correct
     # Set correct/error column for solved benchmarks.
     else:
-        if filter_result:
-            if filter_result == RESULT_UNSAT:
-                negated_filter_result = RESULT_SAT
-            else:
-                assert filter_result == RESULT_SAT
-                negated_filter_result = RESULT_UNSAT
-            # Filter benchmarks based on given verdict.  A benchmark is
-            # marked as sat/unsat if its expected result is sat/unsat, or
-            # its expected result is unknown and at least one solver
-            # returned sat/unsat.
-            data_with_result = \
-                data_new[(data_new.expected == filter_result)
-                         | ((data_new.result == filter_result)
-                            & (data_new.expected == RESULT_UNKNOWN))]
-            benchmarks = set(data_with_result.benchmark.unique())
-            data_new.loc[(~data_new.benchmark.isin(benchmarks))
-                         & (data_new.result != filter_result),
-                         ['cpu_time', 'wallclock_time', 'result']] = \
-                            [0.0, 0.0, RESULT_UNKNOWN]
-            # After 2021, we count unsound results to the sat/unsat
-            # score depending on the solver's result, not the benchmark
-            # status. Before, it was the other way round.
-            if int(year) >= 2021:
-                data_new.loc[data_new.result == negated_filter_result,
-                             ['cpu_time', 'wallclock_time', 'result']] = \
-                                [0.0, 0.0, RESULT_UNKNOWN]
-            else:
-                data_new.loc[data_new.expected == negated_filter_result,
-                             ['cpu_time', 'wallclock_time', 'result']] = \
-                                [0.0, 0.0, RESULT_UNKNOWN]
-
-        # Select benchmarks with results sat/unsat.
-        solved = data_new[(data_new.result == RESULT_SAT)
-                          | (data_new.result == RESULT_UNSAT)]
-        # Select benchmarks that are within the time limit.
-        solved = solved[(solved[time_column] <= wclock_limit)]
+        # Select benchmarks with results sat/unsat that are within the time
+        # limit.
+        solved = ((result == code_sat) | (result == code_unsat)) \
+                 & (time_column <= wclock_limit)
 
         if skip_unknowns:
-            solved = solved[(solved.result == solved.expected)]
+            solved &= result == expected
         else:
-            solved = solved[(solved.expected == RESULT_UNKNOWN)
-                            | (solved.result == solved.expected)]
+            solved &= (expected == code_unknown) | (result == expected)
 
         if unsat_core:
-            data_new.loc[solved.index, 'correct'] = data['reduction']
-            data_new.loc[solved.index, 'error'] = data['result-is-erroneous']
-
-            # Calculate time scores
-            if int(year) >= 2023:
-                data_new['score_cpu_time'] = 0.0
-                data_new['score_wallclock_time'] = 0.0
-                data_new.loc[solved.index,'score_cpu_time'] = \
-                    data_new.cpu_time * data_new.alpha_prime_b
-                data_new.loc[solved.index,'score_wallclock_time'] = \
-                    data_new.wallclock_time * data_new.alpha_prime_b
+            correct = numpy.where(solved, data['reduction'].to_numpy(), 0)
+            error = numpy.where(
+                    solved, data['result-is-erroneous'].to_numpy(), 0)
+            score_times = solved
         # Note: The model validator reports INVALID if a solver crashes on an
         #       instance. Hence, only when a solver reports statisfiable, we
         #       check the status of the model validator.
         elif model_validation:
-            solved = solved[solved.result == RESULT_SAT]
-            solved_valid = solved[solved.model_validator_status == 'VALID']
+            solved &= result == code_sat
+            solved_valid = solved \
+                & (data.model_validator_status == 'VALID').to_numpy()
 
             if int(year) != 2020:
-                solved_invalid = data_new[data_new.model_validator_status == 'INVALID']
+                solved_invalid = data.model_validator_status == 'INVALID'
             else:
                 # Note: The model validator does not report a result, even if
                 #       the solver produces an invalid model or the solver
@@ -566,135 +820,278 @@ def score(division,
                 #       Due to some unknown problem the jobs on fixed and
                 #       best of 2019 solvers produced no entries ("-") in
                 #       that column.
-                incomplete_model = data_new['model_validator_exception']\
+                incomplete_model = data['model_validator_exception']\
                         .str.contains("^(?:.*: \( expected|.*: sat expected|-)$")
-                solved_invalid = data_new[(data_new.model_validator_status == 'INVALID')
-                                          & ((data_new.model_validator_error != 'unhandled_exception')
-                                             | (incomplete_model == False))]
-            data_new.loc[solved_valid.index, 'correct'] = 1
-            data_new.loc[solved_invalid.index, 'error'] = 1
-
-            # Calculate time scores
-            if int(year) >= 2023:
-                data_new['score_cpu_time'] = 0.0
-                data_new['score_wallclock_time'] = 0.0
-                data_new.loc[solved_valid.index,'score_cpu_time'] = \
-                    data_new.cpu_time * data_new.alpha_prime_b
-                data_new.loc[solved_valid.index,'score_wallclock_time'] = \
-                    data_new.wallclock_time * data_new.alpha_prime_b
+                solved_invalid = (data.model_validator_status == 'INVALID') \
+                                 & ((data.model_validator_error != 'unhandled_exception')
+                                    | (incomplete_model == False))
+            correct = solved_valid.astype(int)
+            error = solved_invalid.to_numpy().astype(int)
+            score_times = solved_valid
         elif proof_exhibition:
-            data_new.loc[data_new.reason == 'valid', 'correct'] = 1
-            data_new.loc[data_new.reason == 'invalid', 'unsolved'] = 1
-            data_new.loc[data_new.result == 'sat', 'unsolved'] = 1
-
-            # Calculate time scores
-            if int(year) >= 2023:
-                data_new['score_cpu_time'] = 0.0
-                data_new['score_wallclock_time'] = 0.0
-                data_new.loc[data_new.reason == 'valid','score_cpu_time'] = \
-                    data_new.cpu_time * data_new.alpha_prime_b
-                data_new.loc[data_new.reason == 'valid',\
-                             'score_wallclock_time'] = \
-                                 data_new.wallclock_time * data_new.alpha_prime_b
+            valid = (data.reason == 'valid').to_numpy()
+            correct = valid.astype(int)
+            unsolved[(data.reason == 'invalid').to_numpy()] = 1
+            unsolved[result == code_sat] = 1
+            score_times = valid
         else:
-            data_new.loc[solved.index, 'correct'] = 1
+            correct = solved.astype(int)
 
             # Get all job pairs on which solvers were wrong
-            data_new.loc[(data_new.result != RESULT_UNKNOWN)
-                         & (data_new.result != data_new.expected)
-                         & (data_new.expected != RESULT_UNKNOWN), 'error'] = 1
+            # Note: Missing results have code -1 and are not equal to any
+            #       result (as for the comparison of the categoricals).
+            error = ((result != code_unknown)
+                     & ((result != expected) | (result < 0) | (expected < 0))
+                     & (expected != code_unknown)).astype(int)
 
             # Count number of sat/unsat
-            solved_sat = solved[solved.result == RESULT_SAT]
-            solved_unsat = solved[solved.result == RESULT_UNSAT]
-            data_new.loc[solved_sat.index, 'correct_sat'] = 1
-            data_new.loc[solved_unsat.index, 'correct_unsat'] = 1
-
-            # Calculate time scores
-            if int(year) >= 2023:
-                data_new['score_cpu_time'] = 0.0
-                data_new['score_wallclock_time'] = 0.0
-                data_new.loc[solved.index,'score_cpu_time'] = \
-                    data_new.cpu_time * data_new.alpha_prime_b
-                data_new.loc[solved.index,'score_wallclock_time'] = \
-                    data_new.wallclock_time * data_new.alpha_prime_b
+            correct_sat = (solved & (result == code_sat)).astype(int)
+            correct_unsat = (solved & (result == code_unsat)).astype(int)
+            score_times = solved
 
         # Determine unsolved benchmarks.
-        data_new.loc[data_new.correct == 0, 'unsolved'] = 1
-        if filter_result:
-            data_new.loc[~data_new.benchmark.isin(benchmarks), 'unsolved'] = 0
+        unsolved[correct == 0] = 1
+
+    if int(year) >= 2022:
+        solver_ids = data['configuration_id']
+    else:
+        solver_ids = data['solver_id']
+    solver_codes, solver_uniques = pandas.factorize(solver_ids)
+    competitive = are_competitive_solvers(solver_uniques)[solver_codes]
+
+    # Create the scored data
+    columns = {
+        'division': data['division'],
+        'benchmark': data['benchmark'],
+        'family': data['family'],
+        'solver': data['solver'],
+        'solver_id': solver_ids,
+        'cpu_time': cpu_time,
+        'wallclock_time': wallclock_time,
+        'status': pandas.Categorical.from_codes(
+            status, dtype=data.status.dtype),
+        'result': pandas.Categorical.from_codes(
+            result, dtype=data.result.dtype),
+        'expected': data['expected'],
+        'year': year,
+        'correct': correct,
+        'error': error,
+        'correct_sat': correct_sat,
+        'correct_unsat': correct_unsat,
+        'division_size': num_benchmarks,
+        'competitive': competitive,
+        'timeout': timeout,
+        'memout': memout,
+        'unsolved': unsolved,
+        'configuration_id': data['configuration_id'],
+    }
+    if model_validation:
+        columns['model_validator_status'] = data['model_validator_status']
+        columns['model_validator_error'] = data['model_validator_error']
+        if int(year) == 2020:
+            columns['model_validator_exception'] = \
+                data['model_validator_exception']
+    if proof_exhibition:
+        columns['reason'] = data['reason']
+    if incremental:
+        columns['num_check_sat'] = num_check_sat
 
     # Compute scores
-    data_new['score_correct'] = data_new.correct * data_new.score_modifier
-    data_new['score_error'] = data_new.error * data_new.score_modifier
+    if int(year) >= 2023 and not incremental:
+        columns['score_cpu_time'] = \
+            numpy.where(score_times, cpu_time * alpha_prime_b, 0.0)
+        columns['score_wallclock_time'] = \
+            numpy.where(score_times, wallclock_time * alpha_prime_b, 0.0)
+    columns['score_correct'] = correct * score_modifier
+    columns['score_error'] = error * score_modifier
     if int(year) < 2023:
-        data_new['score_cpu_time'] = data_new.cpu_time * data_new.alpha_prime_b
-        data_new['score_wallclock_time'] = \
-            data_new.wallclock_time * data_new.alpha_prime_b
+        columns['score_cpu_time'] = cpu_time * alpha_prime_b
+        columns['score_wallclock_time'] = wallclock_time * alpha_prime_b
+    elif incremental:
+        solved = correct > 0
+        columns['solver_cpu_time'] = data['solver-cpu-time']
+        columns['solver_wall_time'] = data['solver-wall-time']
+        columns['score_cpu_time'] = numpy.where(
+            solved,
+            data['solver-cpu-time'].to_numpy().astype(float) * alpha_prime_b,
+            0.0)
+        columns['score_wallclock_time'] = numpy.where(
+            solved,
+            data['solver-wall-time'].to_numpy().astype(float) * alpha_prime_b,
+            0.0)
+
+    return pandas.DataFrame(columns, index=data.index, copy=False)
+
+# Derive the scores for the satisfiable or unsatisfiable instances from the
+# scores of all instances (with the same time limit and scoring scheme), such
+# that the sat and unsat scores do not require scoring the division again.
+#
+# A benchmark is marked as sat/unsat if its expected result is sat/unsat, or
+# its expected result is unknown and at least one solver returned sat/unsat.
+# The results (and times) of the job pairs on benchmarks that are not marked
+# and where the solver did not return the filtered result are reset to
+# unknown (and 0), as are the results of the job pairs where
+# - (since 2021) the solver returned the negated result,
+# - (before 2021) the expected result is the negated result,
+# i.e., unsound results count to the sat/unsat score depending on the result
+# of the solver since 2021 and on the benchmark status before.
+#
+# data         : the scored data of all instances as computed by the score
+#                function (with filter_result None)
+# filter_result: RESULT_SAT or RESULT_UNSAT
+# year         : the string identifying the year of the results
+def filter_scores(data, filter_result, year):
+    assert filter_result in [RESULT_SAT, RESULT_UNSAT]
+
+    # Note: For incremental tracks we have to consider all benchmarks.
+    if 'num_check_sat' in data.columns:
+        return data.copy(deep=False)
+
+    result = data.result.cat.codes.to_numpy()
+    expected = data.expected.cat.codes.to_numpy()
+    code_unknown = get_category_code(data.result, RESULT_UNKNOWN)
+    code_sat = get_category_code(data.result, RESULT_SAT)
+    code_unsat = get_category_code(data.result, RESULT_UNSAT)
+    if filter_result == RESULT_UNSAT:
+        code_filter_result = code_unsat
+        code_negated_filter_result = code_sat
     else:
-        if incremental:
-            
-            data_new['solver_cpu_time'] = data['solver-cpu-time']
-            data_new['solver_wall_time'] = data['solver-wall-time']
-            data_new['score_cpu_time'] = 0.0
-            data_new['score_wallclock_time'] = 0.0
+        code_filter_result = code_sat
+        code_negated_filter_result = code_unsat
+
+    with_result = (expected == code_filter_result) \
+                  | ((result == code_filter_result)
+                     & (expected == code_unknown))
+    benchmark_codes = data.benchmark.cat.codes.to_numpy()
+    has_result = numpy.zeros(len(data.benchmark.cat.categories), dtype=bool)
+    has_result[benchmark_codes[with_result]] = True
+    has_result = has_result[benchmark_codes]
+    reset = ~has_result & (result != code_filter_result)
+    if int(year) >= 2021:
+        reset |= result == code_negated_filter_result
+    else:
+        reset |= expected == code_negated_filter_result
 
-            solved = data_new[data_new.correct > 0]
-            
-            data_new.loc[solved.index, 'score_cpu_time'] = \
-                solved.solver_cpu_time.astype(float) * data_new.alpha_prime_b
-            data_new.loc[solved.index, 'score_wallclock_time'] = \
-                solved.solver_wall_time.astype(float) * data_new.alpha_prime_b
-            data_new.drop(columns=['solver_cpu_time','solver_wall_time'])
+    # Column 'model_validator_status' only exists in the model validation track.
+    model_validation = 'model_validator_status' in data.columns
+    # Column 'reason' only exists in proof exhibition track.
+    proof_exhibition = 'reason' in data.columns
+
+    # Job pairs with reset results are not solved, only invalid models are
+    # errors independent of the result and only valid proofs are correct
+    # independent of the result.
+    reset_columns = ['cpu_time', 'wallclock_time', 'correct_sat',
+                     'correct_unsat', 'score_cpu_time', 'score_wallclock_time']
+    if not proof_exhibition:
+        reset_columns.extend(['correct', 'score_correct'])
+    if not model_validation:
+        reset_columns.extend(['error', 'score_error'])
+
+    columns = {}
+    for col in reset_columns:
+        values = data[col].to_numpy(copy=True)
+        values[reset] = 0
+        columns[col] = values
+    result = numpy.where(reset, code_unknown, result)
+    columns['result'] = pandas.Categorical.from_codes(
+            result, dtype=data.result.dtype)
+
+    # Determine unsolved benchmarks, benchmarks that are not marked are not
+    # unsolved.
+    unsolved = columns.get('correct', data.correct.to_numpy()) == 0
+    if proof_exhibition:
+        unsolved |= (data.reason == 'invalid').to_numpy()
+        unsolved |= result == code_sat
+    columns['unsolved'] = (unsolved & has_result).astype(int)
 
-    # Delete temporary columns
-    return data_new.drop(columns=['alpha_prime_b', 'score_modifier'])
+    return data.assign(**columns)
 
 
 ###############################################################################
 # Processing
 ###############################################################################
 
-# Process a CSV file with results of one track.
-# csv          : the input csv
-# year         : the string identifying the year of the results
-# filter_result: - None: consider all instances
-#                - RESULT_SAT: consider only satisfiable instances
-#                - RESULT_UNSAT: consider only unsatisfiable instances
-# use_families : use weighted scoring scheme
-# skip_unknowns: skip benchmarks with status unknown
-def process_csv(csv,
-                year,
-                time_limit,
-                filter_result,
-                use_families,
-                skip_unknowns,
-                sequential):
+# Get the path of the normalized results of a CSV file in the results cache
+# directory 'cache_dir'. The cached results are keyed by the content hash of
+# the CSV file and 'normalization', which identifies how the results were
+# normalized (e.g., the family definition given via option --family-choice).
+def get_results_cache_path(cache_dir, csv, normalization):
+    sha = hashlib.sha256()
+    with open(csv, 'rb') as infile:
+        for block in iter(lambda: infile.read(1 << 20), b''):
+            sha.update(block)
+    return os.path.join(cache_dir, "{}-{}-{}.feather".format(
+        os.path.basename(csv), normalization, sha.hexdigest()))
+
+# Write normalized results data to the results cache.
+# Note: The data is stored as is, categorical columns are stored as such.
+def write_results_cache(data, cache_path):
+    try:
+        data.reset_index(drop=True).to_feather(cache_path)
+    except Exception as e:
+        log('Could not write results cache {}: {}'.format(cache_path, e))
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+
+# Read normalized results data from the results cache.
+def read_results_cache(cache_path):
+    return pandas.read_feather(cache_path)
+
+# Set the column types of normalized results data.
+# Strings with few distinct values (benchmark, division, family, solver,
+# status, result and expected) are stored as categoricals. The 'result' and
+# 'expected' columns share their categories such that they can be compared
+# directly, and the categories include all values that are assigned during
+# scoring. The integer columns of incremental tracks are downcasted.
+# Note: cpu_time and wallclock_time are kept as float64 since the time scores
+#       are sums over these columns and must not change with the
+#       representation of the data.
+def set_results_dtypes(data):
+    for col in ['benchmark', 'division', 'family', 'solver']:
+        data[col] = data[col].astype('category')
+
+    status_categories = set(data.status.dropna().unique())
+    status_categories.update(['timeout', 'memout'])
+    data['status'] = data.status.astype(
+            pandas.CategoricalDtype(sorted(status_categories)))
+
+    result_categories = set(data.result.dropna().unique())
+    result_categories.update(data.expected.dropna().unique())
+    result_categories.update([RESULT_SAT, RESULT_UNSAT, RESULT_UNKNOWN])
+    result_dtype = pandas.CategoricalDtype(sorted(result_categories))
+    data['result'] = data.result.astype(result_dtype)
+    data['expected'] = data.expected.astype(result_dtype)
+
+    for col in ['wrong-answers', 'correct-answers']:
+        if col in data.columns \
+           and pandas.api.types.is_integer_dtype(data[col].dtype):
+            data[col] = pandas.to_numeric(data[col], downcast='integer')
+    return data
+
+# Read a CSV file with results of one track and normalize it.
+# This reads the CSV, normalizes the column names and the 'expected' column,
+# and adds division and family information.
+#
+# csv: the input csv
+def normalize_results_csv(csv):
     global g_args
-    global allLogics
-    global divisionInfo
-    assert not filter_result or filter_result in [RESULT_SAT, RESULT_UNSAT]
-    if g_args.log:
-        log("Process {} with family: '{}', divisions: '{}', "\
-            "year: '{}', time_limit: '{}', "\
-            "use_families: '{}', skip_unknowns: '{}', sequential: '{}', "\
-            "filter_result: '{}'".format(
-            csv,
-            g_args.family,
-            g_args.divisions,
-            year,
-            time_limit,
-            use_families,
-            skip_unknowns,
-            sequential,
-            filter_result))
 
     # Load CSV file
     start = time.time() if g_args.show_timestamps else None
+    stage = start_stage()
     data = pandas.read_csv(csv)
+    end_stage(stage, 'read_csv', data, csv=csv)
     if g_args.show_timestamps:
         log('time read_csv: {}'.format(time.time() - start))
 
+    return normalize_results(data)
+
+# Normalize results data as read from a CSV file (see normalize_results_csv).
+def normalize_results(data):
+    global g_args
+
+    stage = start_stage()
+
     # Remove spaces from columns for ease (other functions rely on this)
     cols = data.columns
     cols = cols.map(lambda x: x.replace(' ', '_'))
@@ -719,21 +1116,64 @@ def process_csv(csv,
     if g_args.show_timestamps:
         log('time add_division_family: {}'.format(time.time() - start))
 
+    end_stage(stage, 'normalize', data)
+    return data
+
+# Read a CSV file with results of one track and prepare it for scoring.
+# The normalized results (see normalize_results_csv) are read from the
+# results cache if option --cache-dir is given and the CSV file was already
+# normalized with the same family definition. A scoring server keeps the
+# normalized results in memory (see g_memo). For incremental tracks, the
+# number of check-sat calls for each benchmark is added. Only the divisions
+# selected via --division-only are kept.
+#
+# csv: the input csv
+def read_results_csv(csv):
+    global g_args
+    global g_memo
+
+    memo_key = None
+    if g_memo is not None:
+        memo_key = get_memo_key(csv, 'results', g_args.family)
+
+    cache_path = None
+    if g_args.cache_dir:
+        cache_path = get_results_cache_path(
+                g_args.cache_dir, csv, g_args.family)
+
+    if memo_key and memo_key in g_memo:
+        # The data in memory is not modified, assigning columns to the
+        # (shallow) copy copies the data on write.
+        data = g_memo[memo_key].copy(deep=False)
+    elif cache_path and os.path.exists(cache_path):
+        start = time.time() if g_args.show_timestamps else None
+        stage = start_stage()
+        data = set_results_dtypes(read_results_cache(cache_path))
+        end_stage(stage, 'read_results_cache', data, csv=csv)
+        if g_args.show_timestamps:
+            log('time read_results_cache: {}'.format(time.time() - start))
+    else:
+        data = normalize_results_csv(csv)
+        stage = start_stage()
+        data = set_results_dtypes(data)
+        end_stage(stage, 'set_results_dtypes', data)
+        if cache_path:
+            write_results_cache(data, cache_path)
+    if memo_key and memo_key not in g_memo:
+        set_memo(memo_key, data.copy(deep=False))
+
+    incremental = 'wrong-answers' in data.columns
+
     # Read a CSV file with the number of check-sat calls for each
     # benchmark.
     # For incremental problems, we need the number of check-sat calls per
     # benchmark in order to correctly compute the largest contribution time
     # ranking.
     if incremental and g_args.incremental:
-        check_sat_info = pandas.read_csv(g_args.incremental)
-        divisions = check_sat_info.benchmark.str.split('/', n=1).str[0]
-        benchmarks = check_sat_info.benchmark.str.split('/', n=1).str[1]
-        checks = check_sat_info.num_check_sat
-        status = dict(((d, b), n)
-                        for d, b, n in zip(divisions, benchmarks, checks))
-        data['num_check_sat'] = \
-            data[['division', 'benchmark']].apply(
-                lambda x: status.get((x.division, x.benchmark), 0), axis=1)
+        stage = start_stage()
+        data = add_num_check_sat(
+                data, read_num_check_sat(g_args.incremental))
+        end_stage(stage, 'add_num_check_sat', data)
 
     # -: consider all divisions
     # else list with divisions to consider
@@ -741,78 +1181,947 @@ def process_csv(csv,
         divisions = g_args.divisions
         data = data[(data.division.isin(set(divisions)))]
 
+    return data
+
+# Read a CSV file with the number of check-sat calls of each benchmark of an
+# incremental track.
+#
+# check_sat_csv: CSV file with columns 'benchmark' (prefixed with the
+#                division) and 'num_check_sat'
+# returns      : a dataframe with columns 'division', 'benchmark' and
+#                'num_check_sat'
+def read_num_check_sat(check_sat_csv):
+    check_sat_info = pandas.read_csv(check_sat_csv)
+    split = check_sat_info.benchmark.str.split('/', n=1, expand=True)
+    counts = pandas.DataFrame({'division': split[0],
+                               'benchmark': split[1],
+                               'num_check_sat': check_sat_info.num_check_sat})
+    # Keep the last entry of duplicate benchmarks.
+    return counts.drop_duplicates(['division', 'benchmark'], keep='last')
+
+# Add column 'num_check_sat' with the number of check-sat calls of each
+# benchmark to the results data of an incremental track.
+# The number of check-sat calls is joined on (division, benchmark), job pairs
+# of benchmarks that are not listed in 'counts' get 0 check-sat calls.
+#
+# counts: the number of check-sat calls as returned by read_num_check_sat
+def add_num_check_sat(data, counts):
+    global g_args
+    keys = data[['division', 'benchmark']].astype(object)
+    merged = keys.merge(counts, on=['division', 'benchmark'], how='left')
+    assert len(merged) == len(data)
+
+    missing = merged.num_check_sat.isna().to_numpy()
+    if missing.any():
+        missing_benchmarks = \
+                keys[missing].drop_duplicates().sort_values(
+                        ['division', 'benchmark'])
+        log('Warning: no number of check-sat calls for {} job pairs '\
+            '({} benchmarks), assuming 0'.format(
+                missing.sum(), len(missing_benchmarks)))
+        if g_args.log:
+            for d, b in zip(missing_benchmarks.division,
+                            missing_benchmarks.benchmark):
+                log('  {}/{}'.format(d, b))
+
+    data['num_check_sat'] = \
+            merged.num_check_sat.fillna(0).astype(int).to_numpy()
+    return data
+
+# Extract the solved benchmarks with status unknown from the normalized
+# results data as returned by read_results_csv, i.e., the benchmarks with
+# status unknown where at least one solver returned sat or unsat. No
+# distinction about solvers being sound or not is made.
+#
+# returns: a data frame with one row per solved benchmark (in the order of
+#          their first job pair) with columns
+#          - 'division'
+#          - 'benchmark': the benchmark as './<division>/<benchmark>'
+#          - 'result': the results sat/unsat of the solvers joined by ';'
+#            (sat results first)
+#          - 'solved_sat'/'solved_unsat': true if a solver returned
+#            sat/unsat
+#          - 'sqSatRes'/'sqUnsatRes': the number of solvers that returned
+#            sat/unsat (as in the benchmark csv of the benchmark selection)
+def get_solved_unknowns(data):
+    result = data.result.cat.codes.to_numpy()
+    sat = result == get_category_code(data.result, RESULT_SAT)
+    unsat = result == get_category_code(data.result, RESULT_UNSAT)
+    unknown = data.expected.cat.codes.to_numpy() \
+            == get_category_code(data.expected, RESULT_UNKNOWN)
+    # Consider only solved unknown benchmarks
+    solved = numpy.flatnonzero(unknown & (sat | unsat))
+    # Note: numpy.char.multiply fails on empty arrays.
+    if len(solved) == 0:
+        return pandas.DataFrame(columns=['division',
+                                         'benchmark',
+                                         'result',
+                                         'solved_sat',
+                                         'solved_unsat',
+                                         'sqSatRes',
+                                         'sqUnsatRes'])
+
+    # Aggregate the results per division and benchmark.
+    division_codes = data.division.cat.codes.to_numpy()[solved]
+    benchmark_codes = data.benchmark.cat.codes.to_numpy()[solved]
+    keys = division_codes.astype(numpy.int64) \
+            * len(data.benchmark.cat.categories) + benchmark_codes
+    _, first, inverse = numpy.unique(keys,
+                                     return_index=True,
+                                     return_inverse=True)
+    num_sat = numpy.bincount(inverse, weights=sat[solved]).astype(int)
+    num_unsat = numpy.bincount(inverse, weights=unsat[solved]).astype(int)
+    order = numpy.argsort(first, kind='stable')
+    first = solved[first[order]]
+    num_sat = num_sat[order]
+    num_unsat = num_unsat[order]
+
+    division = data.division.to_numpy()[first]
+    benchmark = "./" + pandas.Series(division).astype(str) + "/" \
+            + pandas.Series(data.benchmark.to_numpy()[first]).astype(str)
+    results = numpy.char.rstrip(
+            numpy.char.add(numpy.char.multiply(RESULT_SAT + ';', num_sat),
+                           numpy.char.multiply(RESULT_UNSAT + ';', num_unsat)),
+            ';')
+    return pandas.DataFrame({
+        'division': division,
+        'benchmark': benchmark,
+        'result': results,
+        'solved_sat': num_sat > 0,
+        'solved_unsat': num_unsat > 0,
+        'sqSatRes': num_sat,
+        'sqUnsatRes': num_unsat,
+    })
+
+# Write the solved benchmarks with status unknown (see get_solved_unknowns)
+# of the input csv of each year to 'solvedUnknowns<year>.csv' (option
+# --solved-benchs), as input for the benchmark selection (see
+# merge_benchmarks_with_sq_statuses.py in the prep directory of a year).
+def gen_solved_unknowns():
+    global g_args
+    for year in g_args.csv:
+        csv = g_args.csv[year][0]
+        if not os.path.exists(csv):
+            die("Given csv does not exist: {}".format(csv))
+        get_solved_unknowns(read_results_csv(csv)).to_csv(
+                path_or_buf="solvedUnknowns" + str(year) + ".csv",
+                columns=["benchmark", "result", "sqSatRes", "sqUnsatRes"],
+                index=False)
+
+# Compute the fingerprint of the data of one division for the score cache
+# (option --score-cache). The fingerprint covers the job pairs of the
+# division, the competitiveness of its solvers and the scoring script itself.
+def get_division_fingerprint(division_data, year):
+    sha = hashlib.sha256()
+    sha.update(pandas.util.hash_pandas_object(
+        division_data, index=False).to_numpy().tobytes())
+    solver_ids = division_data['configuration_id'] \
+            if int(year) >= 2022 else division_data['solver_id']
+    solver_ids = numpy.sort(solver_ids.unique())
+    sha.update(repr(list(zip(solver_ids.tolist(),
+                             are_competitive_solvers(solver_ids).tolist())))
+               .encode())
+    with open(os.path.abspath(__file__), 'rb') as infile:
+        sha.update(infile.read())
+    return sha.hexdigest()
+
+# Get the path of the scores of a division in the score cache. Scores are
+# stored per year, track, family definition, division and list of scoring
+# scenarios, such that runs on different tracks or with different family
+# definitions can share a score cache.
+def get_score_cache_path(division, year, family_definition, scenarios):
+    global g_args
+    key = hashlib.sha256(repr(scenarios).encode()).hexdigest()[:16]
+    return os.path.join(g_args.score_cache,
+                        "{}-{}-{}-{}-{}.pickle".format(
+                            year, g_args.track, family_definition, division,
+                            key))
+
+# Compute the benchmark scores of the data of one division for a list of
+# scoring scenarios (see score_scenarios). 'family_definition' is the family
+# definition the data was normalized with (see add_division_family_info).
+# If option --score-cache is given, the scores of a division are reused from
+# the score cache if the division data did not change since it was scored,
+# else the division is scored and its scores are stored in the cache.
+#
+# returns: a list with the scored data of each scenario
+def score_division(division, division_data, year, family_definition,
+                   scenarios):
+    global g_args
+
+    stage = start_stage()
+    cache_path = None
+    if g_args.score_cache:
+        cache_path = get_score_cache_path(
+                division, year, family_definition, scenarios)
+        fingerprint = get_division_fingerprint(division_data, year)
+        if os.path.exists(cache_path):
+            with open(cache_path, 'rb') as infile:
+                cached_fingerprint, res = pickle.load(infile)
+            if cached_fingerprint == fingerprint:
+                if g_args.log: log("Reuse scores for {}".format(division))
+                end_stage(stage, 'score_division', division_data,
+                          division=division, year=year, cached=True)
+                return res
+
+    if g_args.log: log("Compute for {}".format(division))
+    # The sat and unsat scores are derived from the scores of all instances
+    # of the scenario with the same time limit and scoring scheme, which is
+    # scored only once.
+    scored = {}
+    res = []
+    for time_limit, filter_result, use_families, skip_unknowns, sequential \
+            in scenarios:
+        key = (time_limit, use_families, skip_unknowns, sequential)
+        if key not in scored:
+            scored[key] = score(division,
+                                division_data,
+                                time_limit,
+                                None,
+                                year,
+                                use_families,
+                                skip_unknowns,
+                                sequential)
+        if filter_result:
+            res.append(filter_scores(scored[key], filter_result, year))
+        else:
+            res.append(scored[key])
+
+    if cache_path:
+        with open(cache_path, 'wb') as outfile:
+            pickle.dump((fingerprint, res), outfile)
+    end_stage(stage, 'score_division', division_data,
+              division=division, year=year, cached=False)
+    return res
+
+# Worker function for scoring a division in a process pool (option --jobs).
+# The results data is not passed to the worker processes but inherited from
+# the parent process (via fork) through global g_pool_data, only the name of
+# the division is passed to the worker.
+#
+# returns: a tuple (res, stages) with the scores as returned by
+#          score_division and the stages measured in the worker process
+#          (option --profile)
+def score_division_worker(division):
+    global g_pool_data
+    global g_profile_stages
+    data, groups, year, family_definition, scenarios = g_pool_data
+    num_stages = len(g_profile_stages)
+    res = score_division(division, data.iloc[groups[division]], year,
+                         family_definition, scenarios)
+    return res, g_profile_stages[num_stages:]
+
+# Compute the benchmark scores of the normalized results data of one track for
+# a list of scoring scenarios. The results data is grouped by division only
+# once and all scenarios are scored on the same division data.
+#
+# data     : the results data as returned by read_results_csv with
+#            disagreements removed
+# year     : the string identifying the year of the results
+# family_definition: the family definition of the results data (see
+#            add_division_family_info)
+# scenarios: a list of tuples
+#            (time_limit, filter_result, use_families, skip_unknowns,
+#             sequential)
+#            with the arguments of the score function for each scenario
+#
+# returns  : a list with the scored data of each scenario (in the order of
+#            'scenarios')
+def score_scenarios(data, year, family_definition, scenarios):
+    global g_args
+    global g_pool_data
+    global g_profile_stages
+
     start = time.time() if g_args.show_timestamps else None
-    # Get solved unknown benchamrks
-    if g_args.solved_benchs:
-        # Consider only solved unknown benchmarks
-        solved_unknown = data[(data.expected == RESULT_UNKNOWN)
-                            & ((data.result == RESULT_SAT)
-                               | (data.result == RESULT_UNSAT))].copy()
-
-        # aggregate per division/benchmark the results in "sat;unsat"
-        # or vice versa or just one (without ;)
-        #
-        # Note that this triggers an exoteric pandas warning, but it's a valid assignment
-        solved_unknown["result"] = \
-            solved_unknown[["division", "benchmark", "result"]].groupby(
-                ["division", "benchmark"])["result"].transform(
-                    lambda x: ";".join(x))
-
-        solved_unknown = solved_unknown[["division", "benchmark", "result"]].drop_duplicates()
-        # join division and benchamrk name
-        solved_unknown["benchmark"] = "./" + \
-            solved_unknown['division'].astype(str) + "/" + solved_unknown['benchmark']
-        return solved_unknown
+    stage = start_stage()
+    # Compute the benchmark scores for each division
+    if g_args.jobs > 1:
+        # Score divisions in a process pool. The results are collected in
+        # the order of the divisions, independent of the order in which the
+        # worker processes finish.
+        groups = data.groupby('division', observed=True).indices
+        divisions = list(groups.keys())
+        g_pool_data = (data, groups, year, family_definition, scenarios)
+        try:
+            with multiprocessing.get_context('fork').Pool(g_args.jobs) as pool:
+                results = pool.map(score_division_worker, divisions,
+                                   chunksize=1)
+        finally:
+            g_pool_data = None
+        for res, stages in results:
+            g_profile_stages.extend(stages)
+        results = [res for res, stages in results]
     else:
-      data = remove_disagreements(data)
+        divisions = []
+        results = []
+        for division, division_data in data.groupby('division', observed=True):
+            divisions.append(division)
+            results.append(score_division(division, division_data, year,
+                                          family_definition, scenarios))
+
+    res = merge_division_scores(divisions, results, scenarios)
+    end_stage(stage, 'score', data, year=year, scenarios=len(scenarios))
     if g_args.show_timestamps:
-        log('time disagreements: {}'.format(time.time() - start))
+        log('time score: {}'.format(time.time() - start))
+    return res
 
-    start = time.time() if g_args.show_timestamps else None
-    # Compute the benchmark scores for each division
-    dfs = []
-    dfsPerLogic = {}
-    for division, division_data in data.groupby('division'):
-        if g_args.log: log("Compute for {}".format(division))
-        res = score(division,
-                    division_data,
-                    time_limit,
-                    filter_result,
-                    year,
-                    use_families,
-                    skip_unknowns,
-                    sequential)
-        dfs.append(res)
-        if g_args.divisions_map:
-          dfsPerLogic[division] = res
+# Merge the scores of all divisions as computed by score_division into one
+# dataframe per scenario. If option --divisions-map is given, the scores of
+# the logics of a division are additionally merged into the scores of the
+# division.
+#
+# divisions: the list of divisions
+# results  : the list of scores of each division as returned by
+#            score_division (in the order of 'divisions')
+# returns  : a list with the scored data of each scenario (in the order of
+#            'scenarios')
+def merge_division_scores(divisions, results, scenarios):
+    global g_args
+    global allLogics
+    global divisionInfo
+
+    dfs = [[] for _ in scenarios]
+    dfsPerLogic = [{} for _ in scenarios]
+    for division, res in zip(divisions, results):
+        for i in range(len(scenarios)):
+            dfs[i].append(res[i])
+            if g_args.divisions_map:
+              dfsPerLogic[i][division] = res[i]
     if g_args.divisions_map:
       # Read divisions from a JSON formatted file.
       divisionInfo = json.load(open(g_args.divisions_map))
       trackDivisions = divisionInfo[g_tracks[g_args.track]]
-      for division in trackDivisions:
-        divDfs = []
-        nBenchmarks = 0
-        logics = trackDivisions[division]
-        for logic in logics:
-          allLogics.add(logic)
-          if logic in dfsPerLogic.keys():
-            divDfs.append(dfsPerLogic[logic])
-            nBenchmarks += len(dfsPerLogic[logic].benchmark.unique())
-        if divDfs:
-          dataNew = pandas.concat(divDfs, ignore_index=True)
-          dataNew['division'] = division
-          dataNew['division_size'] = nBenchmarks
-          dfs.append(dataNew)
+      for i in range(len(scenarios)):
+        for division in trackDivisions:
+          divDfs = []
+          nBenchmarks = 0
+          logics = trackDivisions[division]
+          for logic in logics:
+            allLogics.add(logic)
+            if logic in dfsPerLogic[i].keys():
+              divDfs.append(dfsPerLogic[i][logic])
+              nBenchmarks += len(dfsPerLogic[i][logic].benchmark.unique())
+          if divDfs:
+            dataNew = concat_results(divDfs)
+            dataNew['division'] = division
+            dataNew['division_size'] = nBenchmarks
+            dfs[i].append(dataNew)
+
+    return [concat_results(d) for d in dfs]
+
+# Concatenate data frames with results while keeping categorical columns
+# categorical. For frames with different categories, pandas.concat falls back
+# to object columns, hence the categories are unified (and sorted as in
+# set_results_dtypes) first.
+def concat_results(dfs):
+    for col in dfs[0].columns:
+        columns = [d[col] for d in dfs if col in d.columns]
+        if len(columns) < 2 or not all(
+                isinstance(c.dtype, pandas.CategoricalDtype) for c in columns):
+            continue
+        if all(c.dtype == columns[0].dtype for c in columns):
+            continue
+        categories = pandas.api.types.union_categoricals(
+                columns, sort_categories=True).categories
+        for d in dfs:
+            if col in d.columns:
+                d[col] = d[col].cat.set_categories(categories)
+    return pandas.concat(dfs, ignore_index=True)
+
+# Process a CSV file with results of one track for a list of scoring
+# scenarios. The CSV file is read, normalized and cleaned from disagreements
+# only once, and all scenarios are derived from the same data.
+#
+# csv      : the input csv
+# year     : the string identifying the year of the results
+# scenarios: a list of tuples
+#            (time_limit, filter_result, use_families, skip_unknowns,
+#             sequential)
+#            see process_csv for a description of the tuple elements
+#
+# returns  : a list with the scored data of each scenario (in the order of
+#            'scenarios')
+def process_csv_scenarios(csv, year, scenarios):
+    global g_args
+    for scenario in scenarios:
+        time_limit, filter_result, use_families, skip_unknowns, \
+                sequential = scenario
+        assert not filter_result or filter_result in [RESULT_SAT, RESULT_UNSAT]
+        if g_args.log:
+            log("Process {} with family: '{}', divisions: '{}', "\
+                "year: '{}', time_limit: '{}', "\
+                "use_families: '{}', skip_unknowns: '{}', sequential: '{}', "\
+                "filter_result: '{}'".format(
+                csv,
+                g_args.family,
+                g_args.divisions,
+                year,
+                time_limit,
+                use_families,
+                skip_unknowns,
+                sequential,
+                filter_result))
+
+    data = read_results_csv(csv)
+
+    start = time.time() if g_args.show_timestamps else None
+    data = remove_disagreements(data, year)
     if g_args.show_timestamps:
-        log('time score: {}'.format(time.time() - start))
+        log('time disagreements: {}'.format(time.time() - start))
+
+    return score_scenarios(data, year, g_args.family, scenarios)
+
+# Process a CSV file with results of one track.
+# csv          : the input csv
+# year         : the string identifying the year of the results
+# filter_result: - None: consider all instances
+#                - RESULT_SAT: consider only satisfiable instances
+#                - RESULT_UNSAT: consider only unsatisfiable instances
+# use_families : use weighted scoring scheme
+# skip_unknowns: skip benchmarks with status unknown
+def process_csv(csv,
+                year,
+                time_limit,
+                filter_result,
+                use_families,
+                skip_unknowns,
+                sequential):
+    global g_args
+    return process_csv_scenarios(csv,
+                                 year,
+                                 [(time_limit,
+                                   filter_result,
+                                   use_families,
+                                   skip_unknowns,
+                                   sequential)])[0]
+
+###############################################################################
+# What-if scoring of rule changes
+###############################################################################
+
+# Get the grid of rule variants, i.e., all combinations of the given values
+# for each scoring rule.
+#
+# returns: a list of tuples
+#          (time_limit, family_definition, use_families, skip_unknowns,
+#           sequential)
+def get_rule_variants(time_limits,
+                      family_definitions,
+                      use_families,
+                      skip_unknowns,
+                      sequential):
+    return list(itertools.product(time_limits,
+                                  family_definitions,
+                                  use_families,
+                                  skip_unknowns,
+                                  sequential))
+
+# Replace the family column of normalized results data with the families of
+# the given family definition (see get_family_function).
+def set_family_definition(data, family_definition):
+    fam_func = get_family_function(family_definition)
+    families = fam_func(pandas.Series(data.benchmark.cat.categories))
+    return data.assign(family=pandas.Series(
+        families.to_numpy()[data.benchmark.cat.codes.to_numpy()],
+        index=data.index, dtype='category'))
+
+# Score the results of one track for each of the given rule variants.
+# The disagreements are removed once and the variants that share a family
+# definition are scored in one batch (see score_scenarios).
+#
+# data    : the results data as returned by read_results_csv
+# year    : the string identifying the year of the results
+# variants: a list of tuples as returned by get_rule_variants
+#
+# returns : a dataframe with one row per variant, division and solver with
+#           the rule variant, the scores and the rank of the solver, and
+#           whether it is the winner of the division
+def score_rule_variants(data, year, variants):
+    global g_args
+
+    data = remove_disagreements(data, year)
+
+    tables = [None] * len(variants)
+    families = []
+    for variant in variants:
+        if variant[1] not in families:
+            families.append(variant[1])
+    for family_definition in families:
+        indices = [i for i, v in enumerate(variants)
+                   if v[1] == family_definition]
+        if g_args.log:
+            log("Score {} rule variants with family: '{}'".format(
+                len(indices), family_definition))
+        family_data = data
+        if family_definition != g_args.family:
+            family_data = set_family_definition(data, family_definition)
+        scenarios = []
+        for i in indices:
+            time_limit, _, use_families, skip_unknowns, sequential = \
+                    variants[i]
+            scenarios.append((time_limit,
+                              None,
+                              use_families,
+                              skip_unknowns,
+                              sequential))
+        results = score_scenarios(
+                family_data, year, family_definition, scenarios)
+        for i, result in zip(indices, results):
+            time_limit, family_definition, use_families, skip_unknowns, \
+                    sequential = variants[i]
+            table = group_and_rank_solvers(result, sequential).reset_index()
+            table['name'] = get_solver_names(table.solver_id)
+            # See md_get_div_winners.
+            table['winner'] = (table.competitive == True) \
+                              & (table['rank'] == 1) \
+                              & (table.score_correct > 0)
+            table.insert(0, 'variant', i)
+            table.insert(1, 'time_limit', time_limit)
+            table.insert(2, 'family', family_definition)
+            table.insert(3, 'use_families', use_families)
+            table.insert(4, 'skip_unknowns', skip_unknowns)
+            table.insert(5, 'sequential', sequential)
+            tables[i] = table
+
+    columns = ['variant', 'time_limit', 'family', 'use_families',
+               'skip_unknowns', 'sequential', 'year', 'division', 'name',
+               'solver_id', 'configuration_id', 'competitive', 'rank',
+               'winner', 'correct', 'error', 'score_correct', 'score_error',
+               'score_cpu_time', 'score_wallclock_time']
+    return pandas.concat(tables, ignore_index=True)[columns]
+
+# Write the scores of all rule variants given via options --vary-* for the
+# input csvs to the csv file given via option --what-if.
+def gen_what_if_results():
+    global g_args
+
+    tables = []
+    for year in g_args.csv:
+        csv, time_limit = g_args.csv[year]
+        if not os.path.exists(csv):
+            die("Given csv does not exist: {}".format(csv))
+        variants = get_rule_variants(
+                g_args.vary_time if g_args.vary_time else [time_limit],
+                ['top', 'bot'] if g_args.vary_family else [g_args.family],
+                [False, True] if g_args.vary_weighted \
+                        else [g_args.use_families],
+                [False, True] if g_args.vary_skip_unknowns \
+                        else [g_args.skip_unknowns],
+                [False, True] if g_args.vary_sequential \
+                        else [g_args.sequential])
+        if g_args.log:
+            log("Score {} rule variants for {}".format(len(variants), csv))
+        tables.append(score_rule_variants(read_results_csv(csv),
+                                          year,
+                                          variants))
+    pandas.concat(tables, ignore_index=True).to_csv(
+            path_or_buf=g_args.what_if, index=False)
+
+
+###############################################################################
+# Time-limit sweep
+###############################################################################
+
+# Default time limits of the time-limit sweep (option --time-sweep), limits
+# above the time limit of the competition are ignored.
+g_sweep_times = [24, 60, 120, 300, 600, 1200, 2400]
+
+# Compute the scores of the job pairs of a division for a list of time limits
+# from the job pairs scored only once with the time limit of the competition.
+# As in the score function for a lower time limit:
+# - job pairs with a time (CPU time for sequential scores, else wall clock
+#   time) above the limit are not solved, get no error (except for invalid
+#   models in the model validation track) and count as timeouts, their times
+#   are set to the limit,
+# - job pairs with memouts are within every limit, their times are set to the
+#   limit.
+# Additionally, the solved job pairs of each solver are sorted by time once to
+# compute the cactus curves of the solvers.
+#
+# division_data: the results data of the division with disagreements removed
+# wclock_limit : the time limit of the competition
+# time_limits  : the list of time limits, not above 'wclock_limit'
+#
+# returns      : a tuple (results, cactus) with the scored data of each time
+#                limit (with the columns used by group_solvers) and the
+#                correctly solved score of each solver after each solved job
+#                pair sorted by time ('time', 'solved' and 'score_correct'),
+#                job pairs with memouts are solved at time 0
+def score_time_limits(division,
+                      division_data,
+                      year,
+                      wclock_limit,
+                      time_limits,
+                      use_families,
+                      skip_unknowns,
+                      sequential):
+    global g_args
+    data = score_division(division,
+                          division_data,
+                          year,
+                          g_args.family,
+                          [(wclock_limit,
+                            None,
+                            use_families,
+                            skip_unknowns,
+                            sequential)])[0]
+    if use_families:
+        alpha_prime_b = get_family_weights(division_data)[
+                division_data.family.cat.codes.to_numpy()]
+    else:
+        alpha_prime_b = numpy.ones(len(data))
+
+    memout = data.memout.to_numpy() == 1
+    time_column = data.cpu_time if sequential else data.wallclock_time
+    times = numpy.where(memout, -numpy.inf, time_column.to_numpy())
+    correct = data.correct.to_numpy()
+    score_cpu_time = data.score_cpu_time.to_numpy()
+    score_wallclock_time = data.score_wallclock_time.to_numpy()
+    # Invalid models are errors independent of the time limit.
+    model_validation = 'model_validator_status' in data.columns
+    # Since 2023, only the times of solved job pairs are scored. Job pairs
+    # with memouts are solved if they have a time score (their time is the
+    # time limit).
+    if int(year) >= 2023:
+        penalized_memout = memout \
+                & ((score_cpu_time != 0) | (score_wallclock_time != 0))
+    else:
+        penalized_memout = memout
+
+    results = []
+    for time_limit in time_limits:
+        assert time_limit <= wclock_limit
+        within = times <= time_limit
+        if int(year) >= 2023:
+            penalized = penalized_memout
+        else:
+            penalized = memout | ~within
+        columns = {
+            'year': data['year'],
+            'division': data['division'],
+            'benchmark': data['benchmark'],
+            'solver_id': data['solver_id'],
+            'configuration_id': data['configuration_id'],
+            'competitive': data['competitive'],
+            'division_size': data['division_size'],
+            'memout': data['memout'],
+        }
+        for col in ['correct', 'correct_sat', 'correct_unsat',
+                    'score_correct']:
+            columns[col] = numpy.where(within, data[col].to_numpy(), 0)
+        for col in ['error', 'score_error']:
+            columns[col] = data[col].to_numpy() if model_validation \
+                    else numpy.where(within, data[col].to_numpy(), 0)
+        columns['timeout'] = numpy.where(within, data.timeout.to_numpy(), 1)
+        columns['unsolved'] = (columns['correct'] == 0).astype(int)
+        columns['score_cpu_time'] = numpy.where(
+                penalized, time_limit * alpha_prime_b,
+                numpy.where(within & ~memout, score_cpu_time, 0.0))
+        columns['score_wallclock_time'] = numpy.where(
+                penalized, time_limit * alpha_prime_b,
+                numpy.where(within & ~memout, score_wallclock_time, 0.0))
+        results.append(
+                pandas.DataFrame(columns, index=data.index, copy=False))
+
+    # Sort the solved job pairs of each solver by time.
+    solved = correct != 0
+    solved_data = pandas.DataFrame({
+        'year': year,
+        'division': division,
+        'solver_id': data.solver_id.to_numpy()[solved],
+        'configuration_id': data.configuration_id.to_numpy()[solved],
+        'time': numpy.maximum(times[solved], 0.0),
+        'score_correct': data.score_correct.to_numpy()[solved]})
+    cactus = solved_data.sort_values(
+            ['solver_id', 'configuration_id', 'time'], kind='stable')
+    groups = cactus.groupby(['solver_id', 'configuration_id'], sort=False)
+    cactus['solved'] = groups.cumcount() + 1
+    cactus['score_correct'] = groups.score_correct.cumsum()
+    return results, cactus.reset_index(drop=True)
+
+# Write the scores of the input csvs for the time limits given via option
+# --sweep-times to the csv file given via option --time-sweep, and the cactus
+# curves of the solvers to the csv file given via option --cactus.
+# All time limits are computed from the results scored once with the time
+# limit of the competition (see score_time_limits).
+def gen_time_sweep_results():
+    global g_args
+
+    tables = []
+    cactus_tables = []
+    for year in g_args.csv:
+        csv, wclock_limit = g_args.csv[year]
+        if not os.path.exists(csv):
+            die("Given csv does not exist: {}".format(csv))
+        if g_args.sweep_times:
+            time_limits = sorted(set(g_args.sweep_times))
+            if time_limits[-1] > wclock_limit:
+                die("Time limits of the sweep must not exceed the time "\
+                    "limit {} of {}".format(wclock_limit, csv))
+        else:
+            time_limits = [t for t in g_sweep_times if t < wclock_limit]
+            time_limits.append(wclock_limit)
+
+        data = remove_disagreements(read_results_csv(csv), year)
+        if 'wrong-answers' in data.columns or 'reason' in data.columns:
+            die("Time-limit sweep is not supported for the incremental and "\
+                "proof exhibition tracks")
+
+        divisions = []
+        results = []
+        for division, division_data in data.groupby('division', observed=True):
+            division_results, division_cactus = score_time_limits(
+                    division,
+                    division_data,
+                    year,
+                    wclock_limit,
+                    time_limits,
+                    g_args.use_families,
+                    g_args.skip_unknowns,
+                    g_args.sequential)
+            divisions.append(division)
+            results.append(division_results)
+            cactus_tables.append(division_cactus)
+        results = merge_division_scores(divisions, results, time_limits)
+
+        for time_limit, result in zip(time_limits, results):
+            table = group_and_rank_solvers(result,
+                                           g_args.sequential).reset_index()
+            table['name'] = get_solver_names(table.solver_id)
+            # See md_get_div_winners.
+            table['winner'] = (table.competitive == True) \
+                              & (table['rank'] == 1) \
+                              & (table.score_correct > 0)
+            table.insert(0, 'time_limit', time_limit)
+            tables.append(table)
+
+    columns = ['time_limit', 'year', 'division', 'name', 'solver_id',
+               'configuration_id', 'competitive', 'rank', 'winner', 'correct',
+               'error', 'unsolved', 'timeout', 'memout', 'score_correct',
+               'score_error', 'score_cpu_time', 'score_wallclock_time']
+    if g_args.time_sweep:
+        pandas.concat(tables, ignore_index=True)[columns].to_csv(
+                path_or_buf=g_args.time_sweep, index=False)
+    if g_args.cactus:
+        cactus = pandas.concat(cactus_tables, ignore_index=True)
+        cactus.insert(2, 'name', get_solver_names(cactus.solver_id))
+        cactus.to_csv(path_or_buf=g_args.cactus, index=False)
+
+
+###############################################################################
+# Best solvers
+###############################################################################
+
+# Get the best solvers of each division, i.e., the first ranked solvers
+# (including non-competitive solvers) with a positive correct score and no
+# errors. The best solvers of the previous year are run as non-competitive
+# solvers in the divisions they won (see
+# tools/previous-best/best_solvers_to_csv.py).
+#
+# grouped : The ranked data as returned by group_and_rank_solvers.
+# returns : A data frame with the year, division, name, solver_id and
+#           configuration_id of the best solver of each division. If option
+#           --divisions-map is given, only the divisions of the track are
+#           kept (and not their logics).
+def get_best_solvers(grouped):
+    global g_args
+    winners = grouped[(grouped['rank'] == 1) &
+                      (grouped['score_correct'] > 0) &
+                      (grouped['score_error'] == 0)]
+    winners = winners.reset_index()\
+            .drop_duplicates(['year', 'division'], keep='first')
+    winners['name'] = get_solver_names(winners.solver_id)
+    if g_args.divisions_map:
+        trackDivisions = get_track_divisions()
+        winners = winners[winners.division.isin(trackDivisions)]
+    return winners[['year', 'division', 'name', 'solver_id',
+                    'configuration_id']]
+
+# Get the divisions of the track from the divisions map given via option
+# --divisions-map, the map is read only once.
+def get_track_divisions():
+    global g_args
+    global g_track_divisions
+    if g_track_divisions is None:
+        with open(g_args.divisions_map) as infile:
+            g_track_divisions = \
+                    list(json.load(infile)[g_tracks[g_args.track]].keys())
+    return g_track_divisions
+
+# Compute the best solvers of each division (see get_best_solvers) of the
+# results of all years for a list of scores. The results of each year are
+# read (or loaded from the results cache) only once and scored for all scores.
+# The given arguments override the corresponding options, all other options
+# keep their values from the command line, or their defaults if score.py is
+# used as a module (see tools/previous-best/best_solvers_to_csv.py).
+#
+# results      : A dictionary that maps each year to a tuple (csv, time limit)
+#                with the results of the year (see options --csv and --time).
+# track        : The track of the results (see option --track).
+# solvers      : The csv with the solver registry (see option --solvers).
+# divisions_map: The json with the divisions of each track, or None if the
+#                divisions are the logics (see option --divisions-map).
+# num_check_sat: The csv with the number of check-sat calls of the
+#                incremental benchmarks, or None (see option --incremental).
+# cache_dir    : The directory of the results cache, or None (see option
+#                --cache-dir).
+# sequentials  : A list of booleans, compute sequential scores if true, else
+#                parallel scores.
+# returns      : A data frame with the best solvers of each year, division and
+#                score (see get_best_solvers), ordered by year and division,
+#                solvers that are best for several scores are listed once.
+def query_best_solvers(results, track, solvers, divisions_map=None,
+                       num_check_sat=None, cache_dir=None,
+                       sequentials=[False, True]):
+    global g_args
+    global allLogics, divisionInfo, g_track_divisions
+    if g_args is None:
+        g_args = get_arg_parser(required_args=False).parse_args([])
+    g_args.csv = results
+    g_args.year = list(results.keys())
+    g_args.time = [time_limit for _, time_limit in results.values()]
+    g_args.track = track
+    g_args.solvers = solvers
+    g_args.divisions_map = divisions_map
+    g_args.incremental = num_check_sat
+    g_args.cache_dir = cache_dir
+    if cache_dir and not os.path.exists(cache_dir):
+        os.makedirs(cache_dir)
+    # The divisions of a previous query may be of another track.
+    allLogics = set()
+    divisionInfo = {}
+    g_track_divisions = None
+    read_solvers_csv()
+
+    best = []
+    for year in g_args.csv:
+        csv, time_limit = g_args.csv[year]
+        if not os.path.exists(csv):
+            die("Given csv does not exist: {}".format(csv))
+        scored = process_csv_scenarios(
+                csv,
+                year,
+                [(time_limit,
+                  None,
+                  g_args.use_families,
+                  g_args.skip_unknowns,
+                  sequential) for sequential in sequentials])
+        for result, sequential in zip(scored, sequentials):
+            best.append(
+                    get_best_solvers(group_and_rank_solvers(result,
+                                                            sequential)))
+    best = pandas.concat(best, ignore_index=True)
+    best = best.drop_duplicates()
+    return best.sort_values(['year', 'division'], kind='stable')\
+            .reset_index(drop=True)
 
-    return pandas.concat(dfs, ignore_index=True)
 
 ###############################################################################
 # Report 2015-2018
 ###############################################################################
 
+# The years of the report.
+g_report_years = ['2015', '2016', '2017', '2018']
+
+# The scores of the report variants as computed by compute_report_scores.
+g_report_scores = {}
+
+# Get the scoring scenario of a year for a report variant
+# (see gen_results_for_report_aux).
+def get_report_scenario(year,
+                        filter_result,
+                        time_limit,
+                        sequential,
+                        no_families,
+                        no_unknowns):
+    global g_args
+    return (min(g_args.csv[year][1], time_limit),
+            filter_result,
+            False if no_families or year == '2015' else g_args.use_families,
+            True if no_unknowns else g_args.skip_unknowns,
+            sequential)
+
+# Score the results of one year of the report for a list of report variants.
+# The results csv is read and cleaned from disagreements only once, and
+# variants that result in the same scoring scenario for this year are scored
+# only once.
+#
+# year    : the year of the results
+# variants: a list of tuples
+#           (family_definition, filter_result, time_limit, sequential,
+#            no_families, no_unknowns)
+#
+# returns : a dictionary that maps each variant to the scores of this year
+#           grouped by group_solvers
+def score_report_year(year, variants):
+    global g_args
+
+    data = read_results_csv(g_args.csv[year][0])
+    data = remove_disagreements(data, year)
+
+    res = {}
+    for family_definition in sorted(set(v[0] for v in variants)):
+        family_variants = [v for v in variants if v[0] == family_definition]
+        scenarios = []
+        for variant in family_variants:
+            scenario = get_report_scenario(year, *variant[1:])
+            if scenario not in scenarios:
+                scenarios.append(scenario)
+        family_data = data
+        if family_definition != g_args.family:
+            family_data = set_family_definition(data, family_definition)
+        results = score_scenarios(
+                family_data, year, family_definition, scenarios)
+        grouped = [group_solvers(r) for r in results]
+        for variant in family_variants:
+            res[variant] = grouped[
+                scenarios.index(get_report_scenario(year, *variant[1:]))]
+    return res
+
+# Worker function for scoring one year of the report in a process pool.
+# Divisions are scored sequentially within a worker process (daemonic
+# processes cannot have children).
+#
+# returns: a tuple (res, stages) with the scores as returned by
+#          score_report_year and the stages measured in the worker process
+#          (option --profile)
+def score_report_year_worker(args):
+    global g_args
+    global g_profile_stages
+    g_args.jobs = 1
+    year, variants = args
+    num_stages = len(g_profile_stages)
+    res = score_report_year(year, variants)
+    return res, g_profile_stages[num_stages:]
+
+# Compute the scores of all years of the report for a list of report
+# variants (see score_report_year) and store them in g_report_scores.
+# With option --jobs, the years are scored in parallel.
+def compute_report_scores(variants):
+    global g_args
+    global g_report_scores
+    global g_profile_stages
+
+    start = time.time() if g_args.show_timestamps else None
+    tasks = [(year, variants) for year in g_report_years]
+    if g_args.jobs > 1:
+        with multiprocessing.get_context('fork').Pool(
+                min(g_args.jobs, len(tasks))) as pool:
+            results = pool.map(score_report_year_worker, tasks, chunksize=1)
+        for res, stages in results:
+            g_profile_stages.extend(stages)
+        results = [res for res, stages in results]
+    else:
+        results = [score_report_year(year, v) for year, v in tasks]
+
+    for variant in variants:
+        g_report_scores[variant] = \
+                pandas.concat([r[variant] for r in results])
+    if g_args.show_timestamps:
+        log('time compute_report_scores: {}'.format(time.time() - start))
+
 # Auxiliary function to compute results for years 2015-2018.
+# The scores are looked up in g_report_scores (see compute_report_scores).
 #
 # time_limit : minimum of this limit and the limit used in the competition for
 #              a year (given via command line option) is used
@@ -830,46 +2139,16 @@ def gen_results_for_report_aux(filter_result,
                                no_families = False,
                                no_unknowns = False):
     global g_args
-    dataframes = []
-    dataframes.append(
-            process_csv(
-                g_args.csv['2015'][0],
-                '2015',
-                min(g_args.csv['2015'][1], time_limit),
-                filter_result,
-                False,
-                True if no_unknowns else g_args.skip_unknowns,
-                sequential))
-    dataframes.append(
-            process_csv(
-                g_args.csv['2016'][0],
-                '2016',
-                min(g_args.csv['2016'][1], time_limit),
-                filter_result,
-                False if no_families else g_args.use_families,
-                True if no_unknowns else g_args.skip_unknowns,
-                sequential))
-    dataframes.append(
-            process_csv(
-                g_args.csv['2017'][0],
-                '2017',
-                min(g_args.csv['2017'][1], time_limit),
-                filter_result,
-                False if no_families else g_args.use_families,
-                True if no_unknowns else g_args.skip_unknowns,
-                sequential))
-    dataframes.append(
-            process_csv(
-                g_args.csv['2018'][0],
-                '2018',
-                min(g_args.csv['2018'][1], time_limit),
-                filter_result,
-                False if no_families else g_args.use_families,
-                True if no_unknowns else g_args.skip_unknowns,
-                sequential))
-
-    df = pandas.concat(dataframes, ignore_index=True)
-    return group_and_rank_solvers(df, sequential)
+    global g_report_scores
+    variant = (g_args.family,
+               filter_result,
+               time_limit,
+               sequential,
+               no_families,
+               no_unknowns)
+    if variant not in g_report_scores:
+        compute_report_scores([variant])
+    return rank_solvers(g_report_scores[variant], sequential)
 
 # Helper function to be applied to all rows of a dataframe.
 # returns: A string with sequential and parallel performance winners joined
@@ -950,7 +2229,7 @@ def join_winners_diff(x):
 
 # Get winners for a track and score for the report.
 def get_winners_for_report(df):
-    df['solver_name'] = df['solver_id'].map(get_solver_variant)
+    df['solver_name'] = get_solver_variants(df['solver_id'])
     df = df[(df['rank'] == 1) & (df['score_correct'] > 0)]
     # In some cases there are more than one non-competitive solvers due to how
     # non-competitive solvers are ranked. We only keep the first
@@ -958,7 +2237,7 @@ def get_winners_for_report(df):
     df = df.reset_index()\
             .drop_duplicates(['year', 'division', 'competitive'], keep='first')\
             .sort_values(by='competitive', ascending=False)
-    return df.groupby(['year', 'division'])['solver_name'].apply(' '.join)
+    return df.groupby(['year', 'division'], observed=True)['solver_name'].apply(' '.join)
 
 # Generate and print results table for report:
 #
@@ -975,10 +2254,10 @@ def gen_results_table_for_report(winners_seq,
     df = df.reset_index()
     # join winners (winner first, best non-competing (if any) second)
     if latex:
-        df = df.groupby(['year', 'division'])['solver_name'].apply(
+        df = df.groupby(['year', 'division'], observed=True)['solver_name'].apply(
                 join_winners_latex)
     else:
-        df = df.groupby(['year', 'division'])['solver_name'].apply(
+        df = df.groupby(['year', 'division'], observed=True)['solver_name'].apply(
                 join_winners)
     df = df.unstack(level=0)
     # drop rows with no entry for a denser table that only shows the diff
@@ -1040,12 +2319,14 @@ def gen_results_diff_table_for_report(winners_seq,
     winners_diff_seq = pandas.concat([winners_seq, winners_other_seq])
     winners_diff_seq = winners_diff_seq.reset_index()
     winners_diff_seq = winners_diff_seq.groupby(
-            ['year', 'division'])['solver_name'].apply(join_winners_diff)
+            ['year', 'division'], observed=True)['solver_name'].apply(
+                    join_winners_diff)
     # parallel diff
     winners_diff_par = pandas.concat([winners_par, winners_other_par])
     winners_diff_par = winners_diff_par.reset_index()
     winners_diff_par = winners_diff_par.groupby(
-            ['year', 'division'])['solver_name'].apply(join_winners_diff)
+            ['year', 'division'], observed=True)['solver_name'].apply(
+                    join_winners_diff)
     # print
     gen_results_table_for_report(
             winners_diff_seq, winners_diff_par, latex, diff)
@@ -1054,10 +2335,23 @@ def gen_results_diff_table_for_report(winners_seq,
 # Generate all results for the report.
 def gen_results_for_report():
     global g_args
+
+    # Compute the scores of all tables of the report at once.
+    variants = []
+    for sequential in [True, False]:
+        variants.extend([
+            (g_args.family, None, 2400, sequential, False, False),
+            (g_args.family, RESULT_SAT, 2400, sequential, False, False),
+            (g_args.family, RESULT_UNSAT, 2400, sequential, False, False),
+            (g_args.family, None, 24, sequential, False, False),
+            (g_args.family, None, 2400, sequential, True, False),
+            (g_args.family, None, 2400, sequential, False, True),
+            ('top', None, 2400, sequential, False, False)])
+    compute_report_scores(variants)
+
     print("----------------------------------------------------------------")
     print("SCORE")
     print("----------------------------------------------------------------")
-    start = time.time() if g_args.show_timestamps else None
     score_seq = gen_results_for_report_aux(None, 2400, True)
     score_par = gen_results_for_report_aux(None, 2400, False)
     winners_seq = get_winners_for_report(score_seq)
@@ -1173,61 +2467,91 @@ def gen_results_for_report():
 #                 'division': <division>               # name of division
 #             }
 def biggest_lead_ranking(data, sequential):
-    start = time.time() if g_args.show_timestamps else None
+    return biggest_lead_rankings(
+            [group_and_rank_solvers(data, sequential)], [sequential])[0]
 
-    data = group_and_rank_solvers(data, sequential)
-    data = data[data['competitive'] == True]
-    scores = dict()
-    for year, ydata in data.groupby('year'):
-        for division, div_data in ydata.groupby('division'):
-            # Skip non-competitive divisions
-            if not is_competitive_division(div_data.solver_id.unique()):
-                continue
-            # Skip logics if divisions != logics
-            if g_args.divisions_map and division in allLogics:
-              continue
-            assert len(div_data) >= 2
-            first = div_data[div_data['rank'] == 1]
-            second = div_data[div_data['rank'] == 2]
-            assert len(first) == 1
-            assert len(second) == 1
-            first = first.iloc[0]
-            second = second.iloc[0]
-
-            # If no solver was able to solve a single instance, there is no
-            # winner for this division.
-            if first.score_correct == 0:
-                continue
+# Computes the biggest lead ranking (see biggest_lead_ranking) of several
+# scoring scenarios at once. The first and second ranked competitive solvers
+# of all years and divisions of all scenarios are extracted with one grouped
+# operation and the score and time leads are computed on arrays.
+#
+# ranked     : A list with the data of each scenario as returned by
+#              group_and_rank_solvers.
+# sequentials: A list with the 'sequential' flag of each scenario (selects
+#              the time score used for the time lead).
+#
+# return     : A list with the biggest lead ranking of each scenario.
+def biggest_lead_rankings(ranked, sequentials):
+    global g_args
+    global allLogics
+    start = time.time() if g_args.show_timestamps else None
+    stage = start_stage()
 
-            if sequential:
-                time_first =  first.score_cpu_time
-                time_second = second.score_cpu_time
-            else:
-                time_first =  first.score_wallclock_time
-                time_second = second.score_wallclock_time
-
-            # Compute score and time distance between first and second in the
-            # division.
-            # Note: The time score is only used if solvers have the same score
-            # lead.
-            score = ((1 + first.score_correct) / (1 + second.score_correct))
-            time = (1 + time_second) / (1 + time_first)
-            if year not in scores: scores[year] = []
-            fields = ['score', 'time', 'first_name', 'second_name', \
-                    'division']
-            scores[year].append(dict(zip(fields, (score, time,
-                get_solver_name(first.solver_id),
-                get_solver_name(second.solver_id), division))))
-
-        if year in scores:
+    dfs = []
+    for i, (data, sequential) in enumerate(zip(ranked, sequentials)):
+        data = data[data['competitive'] == True].reset_index()
+        time_column = \
+                'score_cpu_time' if sequential else 'score_wallclock_time'
+        dfs.append(pandas.DataFrame({
+            'scenario': i,
+            'year': data.year.astype(object),
+            'division': data.division.astype(object),
+            'name': get_solver_names(data.solver_id),
+            'rank': data['rank'],
+            'score_correct': data.score_correct,
+            'time': data[time_column]}))
+    data = pandas.concat(dfs, ignore_index=True)
+    keys = ['scenario', 'year', 'division']
+
+    # Skip non-competitive divisions
+    num_names = data.groupby(keys, sort=False)['name'].transform(
+            'nunique', dropna=False)
+    data = data[num_names.to_numpy() > 1]
+    # Skip logics if divisions != logics
+    if g_args.divisions_map:
+        data = data[~data.division.isin(allLogics)]
+
+    first = data[data['rank'] == 1].set_index(keys)
+    second = data[data['rank'] == 2].set_index(keys)
+    assert first.index.is_unique and second.index.is_unique
+    assert len(first) == len(second)
+    second = second.reindex(first.index)
+
+    # If no solver was able to solve a single instance, there is no winner
+    # for this division.
+    solved = first.score_correct.to_numpy() != 0
+    first = first[solved]
+    second = second[solved]
+
+    # Compute score and time distance between first and second in the
+    # division.
+    # Note: The time score is only used if solvers have the same score lead.
+    leads = pandas.DataFrame({
+        'score': (1 + first.score_correct.to_numpy())
+                 / (1 + second.score_correct.to_numpy()),
+        'time': (1 + second.time.to_numpy()) / (1 + first.time.to_numpy()),
+        'first_name': first['name'].to_numpy(),
+        'second_name': second['name'].to_numpy()},
+        index=first.index).sort_index()
+
+    res = [dict() for _ in ranked]
+    fields = ['score', 'time', 'first_name', 'second_name', 'division']
+    for (i, year, division), score, time_lead, first_name, second_name in \
+            zip(leads.index, leads.score, leads.time, leads.first_name,
+                leads.second_name):
+        res[i].setdefault(year, []).append(dict(zip(fields, (
+            score, time_lead, first_name, second_name, division))))
+    for scores in res:
+        for year in scores:
             scores[year] = sorted(scores[year], \
                     key = lambda x: (x['score'], x['time']), \
                     reverse=True)
 
+    end_stage(stage, 'biggest_lead_ranking', leads, scenarios=len(ranked))
     if g_args.show_timestamps:
         log('time biggest_lead_ranking: {}'.format(time.time() - start))
 
-    return scores
+    return res
 
 
 ####
@@ -1235,36 +2559,77 @@ def biggest_lead_ranking(data, sequential):
 ####
 
 # Compute the correctly solved score for the virtual best solver for a given
-# division if the results of 'solver' are excluded. This function corresponds
-# to function vbss(D,S) as defined in section 7.3.2 of the SMT-COMP'19 rules.
+# division, and for each solver the virtual best score if the results of that
+# solver are excluded. This corresponds to function vbss(D,S) as defined in
+# section 7.3.2 of the SMT-COMP'19 rules.
+#
+# The division data is represented as a benchmark x solver matrix of scores
+# and times. For each benchmark, the best and second best job pair (highest
+# correctly solved score, solved the fastest) are determined once. Excluding
+# a solver only changes the virtual best of the benchmarks it is the best
+# solver for, where the second best job pair is picked instead.
 #
 # division_data: The data for a given division
-# solver_id    : The solver to exclude
+# solver_ids   : The solvers to exclude (one at a time)
 # sequential   : True if results are to be computed for sequential performance.
-def vbss(division_data, solver_id, sequential):
-
-    # Remove 'solver_id' and compute the virtual best score and cpu_time.
-    data = division_data[division_data.solver_id != solver_id]
-
-    sort_columns = ['benchmark', 'score_correct']
-    sort_asc = [True, False, True]
-
-    if sequential:
-        sort_columns.append('cpu_time')
-    else:
-        sort_columns.append('wallclock_time')
-
-    # Get job pair with the highest correctly solved score, which was solved
-    # the fastest.
-    data_vbs = data.sort_values(
-                by=sort_columns, ascending=sort_asc).groupby(
-                        'benchmark', as_index=False).first()
-    # note that since solvers don't necessarily run on all logics in a division, these numbers may differ
-    assert len(data_vbs.benchmark.unique()) == len(division_data.benchmark.unique()) or g_args.divisions_map
+#
+# returns      : A tuple (vbs, vbs_without) where 'vbs' is the tuple
+#                (score_correct, time) of the virtual best solver and
+#                'vbs_without' maps each solver in 'solver_ids' to the tuple
+#                (score_correct, time) of the virtual best solver without it.
+def vbss(division_data, solver_ids, sequential):
+    time_column = 'cpu_time' if sequential else 'wallclock_time'
 
-    if sequential:
-        return (data_vbs.score_correct.sum(), data_vbs.cpu_time.sum())
-    return (data_vbs.score_correct.sum(), data_vbs.wallclock_time.sum())
+    b_codes, b_uniques = pandas.factorize(division_data.benchmark, sort=True)
+    s_codes, s_uniques = pandas.factorize(division_data.solver_id)
+    scores = division_data.score_correct.to_numpy(dtype=float)
+    times = division_data[time_column].to_numpy(dtype=float)
+
+    # Keep the best job pair (highest correctly solved score, solved the
+    # fastest) for each benchmark and solver.
+    order = numpy.lexsort((times, -scores, s_codes, b_codes))
+    b_sorted, s_sorted = b_codes[order], s_codes[order]
+    first = numpy.ones(len(order), dtype=bool)
+    first[1:] = (b_sorted[1:] != b_sorted[:-1]) | (s_sorted[1:] != s_sorted[:-1])
+    order = order[first]
+
+    n_benchmarks, n_solvers = len(b_uniques), len(s_uniques)
+    score_matrix = numpy.full((n_benchmarks, n_solvers), -numpy.inf)
+    time_matrix = numpy.full((n_benchmarks, n_solvers), numpy.inf)
+    score_matrix[b_codes[order], s_codes[order]] = scores[order]
+    time_matrix[b_codes[order], s_codes[order]] = times[order]
+
+    # Get the best job pair for each benchmark.
+    def best(score_matrix):
+        best_score = score_matrix.max(axis=1)
+        best_times = numpy.where(score_matrix == best_score[:, None],
+                                 time_matrix, numpy.inf)
+        best_solver = best_times.argmin(axis=1)
+        best_time = best_times[numpy.arange(n_benchmarks), best_solver]
+        return best_score, best_time, best_solver
+
+    score_first, time_first, solver_first = best(score_matrix)
+    score_matrix[numpy.arange(n_benchmarks), solver_first] = -numpy.inf
+    score_second, time_second, _ = best(score_matrix)
+
+    vbs = (score_first.sum(), time_first.sum())
+
+    # Note: Benchmarks that were only run by the excluded solver are not
+    #       considered for the virtual best solver without it.
+    vbs_without = {}
+    solver_index = dict((s, i) for i, s in enumerate(s_uniques))
+    for solver_id in solver_ids:
+        i = solver_index.get(solver_id)
+        is_first = solver_first == i
+        score = numpy.where(is_first, score_second, score_first)
+        time = numpy.where(is_first, time_second, time_first)
+        # note that since solvers don't necessarily run on all logics in a
+        # division, these numbers may differ
+        covered = score != -numpy.inf
+        assert covered.all() or g_args.divisions_map
+        vbs_without[solver_id] = (score[covered].sum(), time[covered].sum())
+
+    return vbs, vbs_without
 
 
 # Largest Contribution Ranking.
@@ -1288,6 +2653,7 @@ def vbss(division_data, solver_id, sequential):
 #         }
 def largest_contribution_ranking(data, time_limit, sequential):
     start = time.time() if g_args.show_timestamps else None
+    stage = start_stage()
 
     # Set cpu_time/wallclock_time to 'time_limit' if solvers were not able to
     # solve the instance. This ensures that if no solver is able to solve the
@@ -1309,7 +2675,7 @@ def largest_contribution_ranking(data, time_limit, sequential):
     for year, ydata in data.groupby('year'):
         num_job_pairs_total = 0
         scores_top = []
-        for division, div_data in data.groupby('division'):
+        for division, div_data in data.groupby('division', observed=True):
             # Skip logics if divisions != logics
             if g_args.divisions_map and division in allLogics:
               continue
@@ -1334,8 +2700,10 @@ def largest_contribution_ranking(data, time_limit, sequential):
             division_size = div_data.division_size.iloc[0]
             num_job_pairs_total += division_size * len(solvers_total)
 
-            # Compute the scores for the virtual best solver
-            vbs_score_correct, vbs_time = vbss(div_data, '', sequential)
+            # Compute the scores for the virtual best solver, and the virtual
+            # best solver without each of the sound solvers.
+            (vbs_score_correct, vbs_time), vbs_without = \
+                vbss(div_data, solvers_sound, sequential)
 
             # If no solver was able to solve a single instance, there is no
             # winner for this division.
@@ -1346,7 +2714,7 @@ def largest_contribution_ranking(data, time_limit, sequential):
             # removing a solver from the virtual best solver.
             scores_div = []
             for solver in solvers_sound:
-                cur_score_correct, cur_time = vbss(div_data, solver, sequential)
+                cur_score_correct, cur_time = vbs_without[solver]
                 assert cur_score_correct <= vbs_score_correct
                 #assert cur_time >= vbs_time
 
@@ -1380,6 +2748,8 @@ def largest_contribution_ranking(data, time_limit, sequential):
             weighted_scores[year] = sorted(weighted_scores[year], \
                     key = lambda x: (x['score'], x['time']), reverse=True)
 
+    end_stage(stage, 'largest_contribution_ranking',
+              rows=sum(len(scores) for scores in weighted_scores.values()))
     if g_args.show_timestamps:
         log('time largest_contribution_ranking: {}'.format(time.time() - start))
 
@@ -1390,20 +2760,128 @@ def largest_contribution_ranking(data, time_limit, sequential):
 # Generate competition results and .md files for website
 ###############################################################################
 
-# Get winner for division and score for results .md files.
-# df: The dataframe containing all data for a division and score.
-def md_get_div_winner(df):
-    if not df[(df.competitive == True) & (df['rank'] == 1)].empty:
-        winner = df[(df.competitive == True) & (df['rank'] == 1)].iloc[0]
-        # If the first ranked solver has a score of 0, there are no winners for
-        # this division.
-        if winner.score_correct > 0:
-            return get_solver_name(winner.solver_id)
-    return '\"-\"'
-
-# Get division score details for results .md files.
+# Number of threads writing the results .md files (see md_write_files).
+g_md_write_threads = 8
+
+# Templates of the results .md files, the fields are filled in by
+# to_md_files and the to_md_files_comp_* functions.
+g_md_div_template = \
+        "---\n"\
+        "layout: result\n"\
+        "resultdate: {resultdate}\n\n"\
+        "year: {year}\n\n"\
+        "divisions: divisions_{year}\n"\
+        "participants: participants_{year}\n\n"\
+        "disagreements: disagreements_{year}\n"\
+        "division: {division}\n"\
+        "track: {track}\n"\
+        "n_benchmarks: {n_benchmarks}\n"\
+        "time_limit: {time_limit}\n"\
+        "mem_limit: {mem_limit}\n"\
+        "{logics}"
+g_md_comp_template = \
+        "---\n"\
+        "layout: result_comp\n"\
+        "resultdate: {resultdate}\n\n"\
+        "year: {year}\n\n"\
+        "results: results_{year}\n"\
+        "participants: participants_{year}\n\n"\
+        "track: {track}\n"\
+        "recognition: {recognition}\n"
+g_md_summary_template = \
+        "---\n"\
+        "layout: results_summary\n"\
+        "track: {track}\n"\
+        "scores: {scores}\n"\
+        "year: {year}\n"\
+        "results: results_{year}\n"\
+        "divisions: divisions_{year}\n"\
+        "participants: participants_{year}\n"\
+        "disagreements: disagreements_{year}\n"\
+        "---\n"
+g_md_biggest_lead_template = \
+        "- name: {first_name}\n"\
+        "  second: {second_name}\n"\
+        "  correctScore: {score:.8f}\n"\
+        "  timeScore: {time:.8f}\n"\
+        "  division: {division}\n"\
+        "  experimental: {experimental}"
+g_md_largest_contribution_template = \
+        "- name: {first_name}\n"\
+        "  correctScore: {score:.8f}\n"\
+        "  timeScore: {time:.8f}\n"\
+        "  division: {division}\n"\
+        "  experimental: {experimental}"
+
+# The winner lines of the scores in the results .md files of the divisions.
+g_md_winner_templates = {
+    'sequential': "winner_seq: {}",
+    'parallel': "winner_par: {}",
+    'sat': "winner_sat: {}",
+    'unsat': "winner_unsat: {}",
+    'twentyfour': "winner_24s: {}\n",
+}
+
+# Get the scores in the results .md files of a track, in the order of the
+# scenarios scored by gen_results_md_files (sequential, parallel, sat, unsat,
+# twentyfour).
+def md_get_scores(track):
+    scores = []
+    if track not in (OPT_TRACK_INC, OPT_TRACK_CHALL_INC, OPT_TRACK_CLOUD,
+                     OPT_TRACK_PARALLEL):
+        scores.append('sequential')
+    scores.append('parallel')
+    if track in (OPT_TRACK_SQ, OPT_TRACK_CHALL_SQ, OPT_TRACK_CLOUD,
+                 OPT_TRACK_PARALLEL):
+        scores.extend(['sat', 'unsat', 'twentyfour'])
+    return scores
+
+# Get the template of the score details of a solver in the results .md files
+# of a track (see md_get_div_score_details).
+def md_get_score_template(track):
+    global g_args
+    lines = ["- name: {name}",
+             "  competing: {competing}",
+             "  errorScore: {score_error}",
+             "  correctScore: {score_correct}"]
+    if track not in (OPT_TRACK_CLOUD, OPT_TRACK_PARALLEL):
+        lines.append("  CPUScore: {score_cpu_time}")
+    lines.append("  WallScore: {score_wallclock_time}")
+    if track in (OPT_TRACK_SQ, OPT_TRACK_CHALL_SQ, OPT_TRACK_CLOUD,
+                 OPT_TRACK_PARALLEL):
+        lines.append("  solved: {correct}")
+        lines.append("  solved_sat: {correct_sat}")
+        lines.append("  solved_unsat: {correct_unsat}")
+    if track != OPT_TRACK_UC and track != OPT_TRACK_MV:
+        lines.append("  unsolved: {unsolved}")
+        if g_args.divisions_map:
+            lines.append("  abstained: {abstained}")
+    lines.append("  timeout: {timeout}")
+    lines.append("  memout: {memout}")
+    return '\n'.join(lines)
+
+# Get the winners of all divisions for a score for results .md files.
 #
-# df          : The dataframe containing all data for a division and score.
+# df     : The ranked data of all divisions for a score as returned by
+#          group_and_rank_solvers.
+# returns: A dictionary that maps year and division to the name of the first
+#          ranked competitive solver, or "-" if there is none or it has a
+#          score of 0 (there are no winners for this division).
+def md_get_div_winners(df):
+    winners = {key: '\"-\"' for key in df.index.unique()}
+    first = df[(df.competitive == True) & (df['rank'] == 1)]
+    first = first[~first.index.duplicated()]
+    for key, name, score_correct in zip(first.index,
+                                        get_solver_names(first.solver_id),
+                                        first.score_correct.tolist()):
+        if score_correct > 0:
+            winners[key] = name
+    return winners
+
+# Get the score details of all divisions for a score for results .md files.
+#
+# df          : The ranked data of all divisions for a score as returned by
+#               group_and_rank_solvers.
 # track       : A string identifying the track, use one of the variables
 #                 - TRACK_SQ
 #                 - TRACK_INC
@@ -1414,151 +2892,71 @@ def md_get_div_winner(df):
 #                 - TRACK_CLOUD
 #                 - TRACK_PARALLEL
 # str_score   : A string identifiying the kind of score to be computed.
-# n_benchmarks: The number of benchmarks in this division.
+# n_benchmarks: Maps year and division to the number of benchmarks in the
+#               division.
+# returns     : A dictionary that maps year and division to the score details.
 def md_get_div_score_details(df, track, str_score, n_benchmarks):
-    lines = ["{}:".format(str_score)]
-    for index, row in df.iterrows():
-        lines.append("- name: {}".format(
-            get_solver_name(row.solver_id)))
-        lines.append("  competing: {}".format(
-            '\"yes\"' if is_competitive_solver(row.solver_id) else '\"no\"'))
-        lines.append("  errorScore: {}".format(
-            row.score_error))
-        lines.append("  correctScore: {}".format(
-            row.score_correct))
-        if track not in (OPT_TRACK_CLOUD, OPT_TRACK_PARALLEL):
-            lines.append("  CPUScore: {}".format(
-                round(row.score_cpu_time, 3)))
-        lines.append("  WallScore: {}".format(
-            round(row.score_wallclock_time, 3)))
-        if track == OPT_TRACK_SQ or track == OPT_TRACK_CHALL_SQ or \
-                track == OPT_TRACK_CLOUD or track == OPT_TRACK_PARALLEL:
-            lines.append("  solved: {}".format(
-                row.correct))
-            lines.append("  solved_sat: {}".format(
-                row.correct_sat))
-            lines.append("  solved_unsat: {}".format(
-                row.correct_unsat))
-        if track != OPT_TRACK_UC and track != OPT_TRACK_MV:
-            lines.append("  unsolved: {}".format(
-                row.unsolved))
-            if g_args.divisions_map:
-              if track == OPT_TRACK_INC:
-                lines.append("  abstained: {}".format(
-                  row.num_check_sat - (row.correct + row.unsolved)))
-              else:
-                lines.append("  abstained: {}".format(
-                  n_benchmarks - (row.correct + row.unsolved)))
-        lines.append("  timeout: {}".format(
-            row.timeout))
-        lines.append("  memout: {}".format(
-            row.memout))
-    return '\n'.join(lines)
-
-
-# Write .md file for a division in a track.
+    template = md_get_score_template(track)
+    keys = df.index.tolist()
+    correct = df.correct.tolist()
+    unsolved = df.unsolved.tolist()
+    if track == OPT_TRACK_INC and 'num_check_sat' in df.columns:
+        total = df.num_check_sat.tolist()
+    else:
+        total = [n_benchmarks[key] for key in keys]
+    columns = {
+        'name': get_solver_names(df.solver_id),
+        'competing': ['\"yes\"' if competing else '\"no\"'
+                      for competing in are_competitive_solvers(df.solver_id)],
+        'score_error': df.score_error.tolist(),
+        'score_correct': df.score_correct.tolist(),
+        'score_cpu_time': [round(t, 3) for t in df.score_cpu_time.tolist()],
+        'score_wallclock_time':
+            [round(t, 3) for t in df.score_wallclock_time.tolist()],
+        'correct': correct,
+        'correct_sat': df.correct_sat.tolist(),
+        'correct_unsat': df.correct_unsat.tolist(),
+        'unsolved': unsolved,
+        'abstained': [n - (c + u) for n, c, u in
+                      zip(total, correct, unsolved)],
+        'timeout': df.timeout.tolist(),
+        'memout': df.memout.tolist(),
+    }
+    details = {key: ["{}:".format(str_score)] for key in keys}
+    names = list(columns.keys())
+    for key, values in zip(keys, zip(*columns.values())):
+        details[key].append(template.format(**dict(zip(names, values))))
+    return {key: '\n'.join(lines) for key, lines in details.items()}
+
+# Strip the result date from the content of a results .md file.
+def md_strip_resultdate(content):
+    return ''.join(line for line in content.splitlines(keepends=True)
+                   if not line.startswith('resultdate:'))
+
+# Write a results .md file if its content (apart from the result date)
+# changed, such that the pages of unchanged results are not rebuilt.
 #
-# division    : A string identifying the division.
-# n_benchmarks: The number of benchmarks in this division.
-# data_seq    : The data set for the sequential score.
-# data_par    : The data set for the parallel score.
-# data_sat    : The data set for the sat score.
-# data_unsat  : The data set for the unsat score.
-# data_24s    : The data set for the 24s score.
-# year        : A string identifying the year of the competition.
-# path        : The path of the directory to write the .md file.
-# time_limit  : The time_limit limit.
-def md_write_file(division,
-                  n_benchmarks,
-                  data_seq, data_par, data_sat, data_unsat, data_24s,
-                  year,
-                  path,
-                  track,
-                  usedLogics,
-                  time_limit):
-    global g_tracks, g_exts
-    # general info about the current division
-    str_div = \
-            "---\n"\
-            "layout: result\n"\
-            "resultdate: {}\n\n"\
-            "year: {}\n\n"\
-            "divisions: divisions_{}\n"\
-            "participants: participants_{}\n\n"\
-            "disagreements: disagreements_{}\n"\
-            "division: {}\n"\
-            "track: {}\n"\
-            "n_benchmarks: {}\n"\
-            "time_limit: {}\n"\
-            "mem_limit: {}\n"\
-            .format(datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    year,
-                    year,
-                    year,
-                    year,
-                    division,
-                    g_tracks[track],
-                    n_benchmarks,
-                    time_limit,
-                    "60" if track != OPT_TRACK_CLOUD and track != OPT_TRACK_PARALLEL else "N/A"
-                    )
-    # for each logic in division, see if there was any
-
-    # if division != logic and this is a true division, add logics
-    if g_args.divisions_map and not division in allLogics:
-      assert usedLogics
-      allLogicsStr = ""
-      # sort by logic
-      usedlogics = sorted(usedLogics.items(), key = lambda x: x[0])
-      first = True
-      for logic, nBench in usedLogics.items():
-        allLogicsStr += "\n" + ("- " if first else "  ")
-        first = False
-        allLogicsStr += "%s: %s" % (logic, nBench)
-      str_div += "logics:%s\n" % allLogicsStr
-
-    # winners
-    str_winners = ["winner_par: {}".format(md_get_div_winner(data_par))]
-    # division scores
-    str_div_scores = \
-        [ md_get_div_score_details(data_par, track, 'parallel', n_benchmarks) ]
-
-    if not data_seq.empty:
-        str_winners.insert(
-                0, "winner_seq: {}".format(md_get_div_winner(data_seq)))
-        str_div_scores.insert(
-                0, md_get_div_score_details(
-                    data_seq, track, 'sequential', n_benchmarks))
-
-    if not data_sat.empty:
-        str_winners.append(
-                "winner_sat: {}".format(md_get_div_winner(data_sat)))
-        str_div_scores.append(
-                md_get_div_score_details(
-                    data_sat, track, 'sat', n_benchmarks))
-
-    if not data_unsat.empty:
-        str_winners.append("winner_unsat: {}".format(
-                md_get_div_winner(data_unsat)))
-        str_div_scores.append(
-                md_get_div_score_details(
-                    data_unsat, track, 'unsat', n_benchmarks))
-
-    if not data_24s.empty:
-        str_winners.append(
-                "winner_24s: {}\n".format(md_get_div_winner(data_24s)))
-        str_div_scores.append(
-                md_get_div_score_details(
-                    data_24s, track, 'twentyfour', n_benchmarks))
-
-    str_winners = "\n".join(str_winners)
-    str_div_scores = "\n".join(str_div_scores)
-
-    # write md file
-    file_path = os.path.join(path, "{}{}".format(division, g_exts[track]))
+# returns: True if the file was written.
+def md_write_if_changed(file_path, content):
+    if os.path.exists(file_path):
+        with open(file_path) as infile:
+            if md_strip_resultdate(infile.read()) == \
+                    md_strip_resultdate(content):
+                return False
     with open(file_path, "w") as outfile:
-        outfile.write(
-                "\n".join([str_div, str_winners, str_div_scores, '---\n']))
+        outfile.write(content)
+    return True
+
+# Write results .md files (see md_write_if_changed) with a pool of threads.
+#
+# files: A list of tuples with the path and the content of each file.
+def md_write_files(files):
+    global g_args
+    with concurrent.futures.ThreadPoolExecutor(g_md_write_threads) as pool:
+        written = list(pool.map(lambda f: md_write_if_changed(*f), files))
+    if g_args.log:
+        log("Wrote {} of {} results .md files ({} unchanged)".format(
+            sum(written), len(files), len(files) - sum(written)))
 
 
 # Generate results .md files for each division in a track.
@@ -1578,128 +2976,72 @@ def to_md_files(results_seq,
                 path,
                 track,
                 time):
+    global g_tracks, g_exts
 
     if not os.path.exists(path):
         os.mkdir(path)
 
-    # level=[0,1]: group results by year and division
-    results = (
-               results_seq.groupby(level=[0,1]),
-               results_par.groupby(level=[0,1]),
-               results_sat.groupby(level=[0,1]),
-               results_unsat.groupby(level=[0,1]),
-               results_24s.groupby(level=[0,1]),
-              )
-    # iterate over divisions in track
-    # (results are zipped together for iteration)
-    empty = pandas.DataFrame()
-
-    for data_seq, data_par, data_sat, data_unsat, data_24s in zip(*results):
-        # assert that results are complete and correctly zipped togeher, i.e.,
-        # year and division of individual results must match
-        assert data_seq[0] == data_par[0] == data_sat[0]
-        assert data_sat[0] == data_unsat[0] == data_24s[0]
-        year, division = data_seq[0]
-        # the actual results data of the current division
-        data_seq = data_seq[1]
-        data_par = data_par[1]
-        data_sat = data_sat[1]
-        data_unsat = data_unsat[1]
-        data_24s = data_24s[1]
-        # total number of benchmarks in the current division
-        n_benchmarks = data_seq.iloc[0].division_size
-        # track string
-        track_str = ""
-        ext_str = ".md"
-        usedLogics = {}
+    results = {
+        'sequential': results_seq,
+        'parallel': results_par,
+        'sat': results_sat,
+        'unsat': results_unsat,
+        'twentyfour': results_24s,
+    }
+    # total number of benchmarks in each division
+    division_sizes = results_seq.division_size
+    division_sizes = division_sizes[~division_sizes.index.duplicated()]
+    n_benchmarks = dict(zip(division_sizes.index, division_sizes.tolist()))
+    if g_args.divisions_map:
+        logic_sizes = dict(zip(division_sizes.index.get_level_values(1),
+                               division_sizes.tolist()))
+
+    # winners and score details of all divisions for each score
+    scores = md_get_scores(track)
+    winners = {}
+    details = {}
+    for score_name in scores:
+        winners[score_name] = md_get_div_winners(results[score_name])
+        details[score_name] = md_get_div_score_details(
+                results[score_name], track, score_name, n_benchmarks)
+
+    resultdate = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    files = []
+    for key in winners['parallel']:
+        year, division = key
+        # assert that results are complete, i.e., every score has results
+        # for the division
+        assert all(key in winners[score_name] for score_name in scores)
+        # if division != logic and this is a true division, add logics
+        logics = ""
         if g_args.divisions_map and not division in allLogics:
-          tmpDf = results_seq.reset_index()
-          divLogics = divisionInfo[g_tracks[track]][division]
-          for logic in divLogics:
-            logicDf = tmpDf[tmpDf['division'] == logic]
-            if len(logicDf) > 0:
-             usedLogics[logic] = logicDf['division_size'].iloc[0]
-        if track == OPT_TRACK_SQ:
-            md_write_file(division,
-                          n_benchmarks,
-                          data_seq, data_par, data_sat, data_unsat, data_24s,
-                          year,
-                          path,
-                          track,
-                          usedLogics,
-                          time)
-        elif track == OPT_TRACK_INC:
-            md_write_file(division,
-                          n_benchmarks,
-                          empty, data_par, empty, empty, empty,
-                          year,
-                          path,
-                          track,
-                          usedLogics,
-                          time)
-        elif track == OPT_TRACK_UC:
-            md_write_file(division,
-                          n_benchmarks,
-                          data_seq, data_par, empty, empty, empty,
-                          year,
-                          path,
-                          track,
-                          usedLogics,
-                          time)
-        elif track == OPT_TRACK_MV:
-            md_write_file(division,
-                          n_benchmarks,
-                          data_seq, data_par, empty, empty, empty,
-                          year,
-                          path,
-                          track,
-                          usedLogics,
-                          time)
-        elif track == OPT_TRACK_PE:
-            md_write_file(division,
-                          n_benchmarks,
-                          data_seq, data_par, empty, empty, empty,
-                          year,
-                          path,
-                          track,
-                          usedLogics,
-                          time)
-        elif track == OPT_TRACK_CHALL_SQ:
-            md_write_file(division,
-                          n_benchmarks,
-                          data_seq, data_par, data_sat, data_unsat, data_24s,
-                          year,
-                          path,
-                          track,
-                          usedLogics,
-                          time)
-        elif track == OPT_TRACK_CHALL_INC:
-            md_write_file(division,
-                          n_benchmarks,
-                          empty, data_par, empty, empty, empty,
-                          year,
-                          path,
-                          track,
-                          usedLogics,
-                          time)
-        elif track == OPT_TRACK_CLOUD:
-            md_write_file(division,
-                          n_benchmarks,
-                          empty, data_par, data_sat, data_unsat, data_24s,
-                          year,
-                          path,
-                          track,
-                          usedLogics,
-                          time)
-        elif track == OPT_TRACK_PARALLEL:
-            md_write_file(division,
-                          n_benchmarks,
-                          empty, data_par, data_sat, data_unsat, data_24s,
-                          year,
-                          path,
-                          track,
-                          usedLogics,
-                          time)
+            usedLogics = [(logic, logic_sizes[logic])
+                          for logic in divisionInfo[g_tracks[track]][division]
+                          if logic in logic_sizes]
+            assert usedLogics
+            logics = "logics:{}\n".format(''.join(
+                "\n{}{}: {}".format("- " if i == 0 else "  ", logic, size)
+                for i, (logic, size) in enumerate(usedLogics)))
+        str_div = g_md_div_template.format(
+                resultdate=resultdate,
+                year=year,
+                division=division,
+                track=g_tracks[track],
+                n_benchmarks=n_benchmarks[key],
+                time_limit=time,
+                mem_limit="60" if track != OPT_TRACK_CLOUD and
+                                  track != OPT_TRACK_PARALLEL else "N/A",
+                logics=logics)
+        str_winners = "\n".join(
+                g_md_winner_templates[score_name].format(winners[score_name][key])
+                for score_name in scores)
+        str_div_scores = "\n".join(details[score_name][key]
+                                    for score_name in scores)
+        file_path = os.path.join(path, "{}{}".format(division, g_exts[track]))
+        files.append(
+                (file_path,
+                 "\n".join([str_div, str_winners, str_div_scores, '---\n'])))
+    md_write_files(files)
 
 # Get score details for competition-wide biggest lead recognition .md file
 # for a division and score.
@@ -1707,17 +3049,14 @@ def to_md_files(results_seq,
 def md_comp_get_div_biggest_lead(bl, expdivs = []):
     str_bl = []
     for div_bl in bl:
-
-        str_bl.append("- name: {}\n"\
-                      "  second: {}\n"\
-                      "  correctScore: {:.8f}\n"\
-                      "  timeScore: {:.8f}\n"\
-                      "  division: {}\n"\
-                      "  experimental: {}".format( \
-                      div_bl['first_name'], div_bl['second_name'], \
-                      div_bl['score'], div_bl['time'], \
-                      div_bl['division'], \
-                      ((div_bl['division'] in expdivs) and "true") or "false"))
+        str_bl.append(g_md_biggest_lead_template.format(
+                      first_name=div_bl['first_name'],
+                      second_name=div_bl['second_name'],
+                      score=div_bl['score'],
+                      time=div_bl['time'],
+                      division=div_bl['division'],
+                      experimental=((div_bl['division'] in expdivs) and
+                                    "true") or "false"))
     return "\n".join(str_bl)
 
 # Get the name of the highest-scoring solver from competition-wide
@@ -1748,11 +3087,13 @@ def md_comp_get_nonexperimental_winner(comp_data, year, exp_divisions):
 # Generate results .md file for competition-wide biggest lead contribution for
 # a track.
 #
-# results_seq  : The data set for the sequential score.
-# results_par  : The data set for the parallel score.
-# results_sat  : The data set for the sat score.
-# results_unsat: The data set for the unsat score.
-# results_24s  : The data set for the 24s score.
+# results_seq  : The ranked data set for the sequential score.
+# results_par  : The ranked data set for the parallel score.
+# results_sat  : The ranked data set for the sat score.
+# results_unsat: The ranked data set for the unsat score.
+# results_24s  : The ranked data set for the 24s score.
+#
+# Note: The data sets are expected as returned by group_and_rank_solvers.
 # path         : The path of the directory to write the .md files.
 # time_limit   : The time limit.
 # track        : A string identifying the track, use one of the variables
@@ -1773,30 +3114,21 @@ def to_md_files_comp_biggest_lead(results_seq,
                                   expdivs):
     global g_tracks, g_exts, g_args
 
-    bl_seq = biggest_lead_ranking(results_seq, True)
-    bl_par = biggest_lead_ranking(results_par, False)
-    bl_sat = biggest_lead_ranking(results_sat, False)
-    bl_unsat = biggest_lead_ranking(results_unsat, False)
-    bl_24s = biggest_lead_ranking(results_24s, False)
+    bl_seq, bl_par, bl_sat, bl_unsat, bl_24s = biggest_lead_rankings(
+            [results_seq, results_par, results_sat, results_unsat,
+             results_24s],
+            [True, False, False, False, False])
 
     for year in bl_seq:
         str_bl = []
         str_comp = []
 
-        str_comp.append( "---\n"\
-                         "layout: result_comp\n"\
-                         "resultdate: {}\n\n"\
-                         "year: {}\n\n"\
-                         "results: results_{}\n"\
-                         "participants: participants_{}\n\n"\
-                         "track: {}\n"\
-                         "recognition: biggest_lead\n"\
-                         .format(datetime.datetime.now().strftime(
-                                     "%Y-%m-%d %H:%M:%S"),
-                                 year,
-                                 year,
-                                 year,
-                                 g_tracks[track]))
+        str_comp.append(g_md_comp_template.format(
+                resultdate=datetime.datetime.now().strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                year=year,
+                track=g_tracks[track],
+                recognition='biggest_lead'))
 
         winner_par_str = \
                 md_comp_get_nonexperimental_winner(bl_par, \
@@ -1852,8 +3184,8 @@ def to_md_files_comp_biggest_lead(results_seq,
         str_bl = "\n".join(str_bl)
         # write md file
         file_path = os.path.join(path, "biggest-lead{}".format(g_exts[track]))
-        with open(file_path, "w") as outfile:
-            outfile.write("\n".join([str_comp, str_bl, '---\n']))
+        md_write_if_changed(file_path,
+                            "\n".join([str_comp, str_bl, '---\n']))
 
 # Get score details for competition-wide largest contribution recognition
 # .md file for a division and score.
@@ -1862,14 +3194,13 @@ def to_md_files_comp_biggest_lead(results_seq,
 def md_comp_get_div_largest_contribution(lc, expdivs = []):
     str_lc = []
     for div_lc in lc:
-        str_lc.append("- name: {}\n"\
-                      "  correctScore: {:.8f}\n"\
-                      "  timeScore: {:.8f}\n"\
-                      "  division: {}\n"\
-                      "  experimental: {}".format(\
-                      div_lc['first_name'], div_lc['score'],\
-                      div_lc['time'], div_lc['division'], \
-                      ((div_lc['division'] in expdivs) and "true") or "false"))
+        str_lc.append(g_md_largest_contribution_template.format(
+                      first_name=div_lc['first_name'],
+                      score=div_lc['score'],
+                      time=div_lc['time'],
+                      division=div_lc['division'],
+                      experimental=((div_lc['division'] in expdivs) and
+                                    "true") or "false"))
     return "\n".join(str_lc)
 
 # Generate results .md file for competition-wide largest contribution for
@@ -1910,20 +3241,12 @@ def to_md_files_comp_largest_contribution(results_seq,
         str_comp = []
         str_lc = []
 
-        str_comp.append("---\n"\
-                        "layout: result_comp\n"\
-                        "resultdate: {}\n\n"\
-                        "year: {}\n\n"\
-                        "results: results_{}\n"\
-                        "participants: participants_{}\n\n"\
-                        "track: {}\n"\
-                        "recognition: largest_contribution\n"\
-                        .format(datetime.datetime.now().strftime(
-                                "%Y-%m-%d %H:%M:%S"),
-                                year,
-                                year,
-                                year,
-                                g_tracks[track]))
+        str_comp.append(g_md_comp_template.format(
+                resultdate=datetime.datetime.now().strftime(
+                    "%Y-%m-%d %H:%M:%S"),
+                year=year,
+                track=g_tracks[track],
+                recognition='largest_contribution'))
 
         par_winner_str = \
                 md_comp_get_nonexperimental_winner(lc_par, year, expdivs)
@@ -1980,8 +3303,8 @@ def to_md_files_comp_largest_contribution(results_seq,
         # write md file
         file_path = os.path.join(
             path, "largest-contribution{}".format(g_exts[track]))
-        with open(file_path, "w") as outfile:
-            outfile.write("\n".join([str_comp, str_lc, '---\n']))
+        md_write_if_changed(file_path,
+                            "\n".join([str_comp, str_lc, '---\n']))
 
 
 # Generate results .md file for competition-wide overview for a track.
@@ -1997,35 +3320,14 @@ def to_md_files_comp_largest_contribution(results_seq,
 #                  - TRACK_MV
 def to_md_files_comp_summary(year, path, track):
     global g_tracks, g_exts, g_args
-    scores = []
-    if track != OPT_TRACK_INC and track != OPT_TRACK_CHALL_INC and \
-            track != OPT_TRACK_CLOUD and track != OPT_TRACK_PARALLEL:
-        scores.append("sequential")
-    scores.append("parallel")
-    if track == OPT_TRACK_SQ or track == OPT_TRACK_CHALL_SQ or \
-            track == OPT_TRACK_CLOUD or track == OPT_TRACK_PARALLEL:
-        scores.append("sat")
-        scores.append("unsat")
-        scores.append("twentyfour")
-
-    str_results = ("---\n"\
-                   "layout: results_summary\n"\
-                   "track: {track}\n"\
-                   "scores: {scores}\n"\
-                   "year: {year}\n"\
-                   "results: results_{year}\n"\
-                   "divisions: divisions_{year}\n"\
-                   "participants: participants_{year}\n"\
-                   "disagreements: disagreements_{year}\n"\
-                   "---\n"
-                   .format(year=year,
-                           scores=",".join(scores),
-                           track=g_tracks[track]))
+    str_results = g_md_summary_template.format(
+            year=year,
+            scores=",".join(md_get_scores(track)),
+            track=g_tracks[track])
 
     # write md file
     file_path = os.path.join(path, "results{}".format(g_exts[track]))
-    with open(file_path, "w") as outfile:
-        outfile.write(str_results)
+    md_write_if_changed(file_path, str_results)
 
 
 # Generate all results .md files for the competition website.
@@ -2036,46 +3338,28 @@ def to_md_files_comp_summary(year, path, track):
 # path      : The path of the directory to write the .md file.
 def gen_results_md_files(csv, time_limit, year, path, path_comp):
     global g_args
-    results_seq = process_csv(csv,
-                              year,
-                              time_limit,
-                              None,
-                              g_args.use_families,
-                              g_args.skip_unknowns,
-                              True)
-    results_par = process_csv(csv,
-                              year,
-                              time_limit,
-                              None,
-                              g_args.use_families,
-                              g_args.skip_unknowns,
-                              False)
-    results_sat = process_csv(csv,
-                              year,
-                              time_limit,
-                              RESULT_SAT,
-                              g_args.use_families,
-                              g_args.skip_unknowns,
-                              False)
-    results_unsat = process_csv(csv,
-                                year,
-                                time_limit,
-                                RESULT_UNSAT,
-                                g_args.use_families,
-                                g_args.skip_unknowns,
-                                False)
-    results_24s = process_csv(csv,
-                              year,
-                              24,
-                              None,
-                              g_args.use_families,
-                              g_args.skip_unknowns,
-                              False)
+    # Read and normalize the results only once and score all scenarios
+    # (sequential, parallel, sat, unsat, 24s) on the same data.
+    results_seq, results_par, results_sat, results_unsat, results_24s = \
+            process_csv_scenarios(
+                    csv,
+                    year,
+                    [(time_limit, None, g_args.use_families,
+                      g_args.skip_unknowns, True),
+                     (time_limit, None, g_args.use_families,
+                      g_args.skip_unknowns, False),
+                     (time_limit, RESULT_SAT, g_args.use_families,
+                      g_args.skip_unknowns, False),
+                     (time_limit, RESULT_UNSAT, g_args.use_families,
+                      g_args.skip_unknowns, False),
+                     (24, None, g_args.use_families,
+                      g_args.skip_unknowns, False)])
     results_seq_grouped = group_and_rank_solvers(results_seq, True)
     results_par_grouped = group_and_rank_solvers(results_par, False)
     results_sat_grouped = group_and_rank_solvers(results_sat, False)
     results_unsat_grouped = group_and_rank_solvers(results_unsat, False)
     results_24s_grouped = group_and_rank_solvers(results_24s, False)
+    stage = start_stage()
     to_md_files(results_seq_grouped,
                 results_par_grouped,
                 results_sat_grouped,
@@ -2084,14 +3368,16 @@ def gen_results_md_files(csv, time_limit, year, path, path_comp):
                 path,
                 g_args.track,
                 time_limit)
+    end_stage(stage, 'to_md_files', year=year)
     # At the moment we do not compute global rankings or ranked summaries for
     # proof exhibition track, since we do not evaluate performance there
     if g_args.track != "pe":
-      to_md_files_comp_biggest_lead(results_seq,
-                                    results_par,
-                                    results_sat,
-                                    results_unsat,
-                                    results_24s,
+      stage = start_stage()
+      to_md_files_comp_biggest_lead(results_seq_grouped,
+                                    results_par_grouped,
+                                    results_sat_grouped,
+                                    results_unsat_grouped,
+                                    results_24s_grouped,
                                     path_comp,
                                     time_limit,
                                     g_args.track,
@@ -2108,16 +3394,19 @@ def gen_results_md_files(csv, time_limit, year, path, path_comp):
       to_md_files_comp_summary(year,
                                path_comp,
                                g_args.track)
+      end_stage(stage, 'to_md_files_comp', year=year)
 
 
 ###############################################################################
 # Main
 ###############################################################################
 
-# Parse command line arguments.
-def parse_args():
-    global g_args
-
+# Get the parser of the command line arguments.
+#
+# required_args: false if the required arguments may be omitted, to get the
+#                default options when score.py is used as a module (see
+#                query_best_solvers)
+def get_arg_parser(required_args=True):
     parser = ArgumentParser()
 
     parser.add_argument("-f", "--family-choice",
@@ -2152,17 +3441,55 @@ def parse_args():
                         action="store_true",
                         default=False,
                         help="Log time for computation steps")
+    parser.add_argument("--profile",
+                        metavar="json",
+                        default=None,
+                        help="Write the wall time, CPU time, peak memory "\
+                             "usage and number of rows of each stage "\
+                             "(reading, normalization, disagreements, "\
+                             "scoring of each division, ranking and "\
+                             "Markdown generation) to the given json file")
+    parser.add_argument("--profile-dump",
+                        metavar="file",
+                        default=None,
+                        help="Profile the run with cProfile and write the "\
+                             "statistics to the given file (or with "\
+                             "pyinstrument as HTML if it ends with .html, "\
+                             "requires pyinstrument)")
     parser.add_argument("-l", "--log",
                         action="store_true",
                         default=False,
                         help="Enable logging")
+    parser.add_argument("--disagreements",
+                        metavar="file",
+                        default=None,
+                        help="Write the results of sound solvers on "\
+                             "disagreeing benchmarks to the given csv "\
+                             "(or Markdown if it ends with .md) file, "\
+                             "'{year}' is replaced by the year")
+    parser.add_argument("-j", "--jobs",
+                        type=int,
+                        default=1,
+                        help="Number of processes for scoring divisions "\
+                             "in parallel")
+    parser.add_argument("--score-cache",
+                        metavar="dir",
+                        default=None,
+                        help="Directory for storing the scores of each "\
+                             "division, only divisions whose results "\
+                             "changed since the last run are rescored")
+    parser.add_argument("--cache-dir",
+                        metavar="dir",
+                        default=None,
+                        help="Directory for caching the normalized results "\
+                             "of the input csvs (requires pyarrow)")
     parser.add_argument('-i', '--incremental',
                         type=str,
                         help='CSV containing incremental status information')
     parser.add_argument("-b", "--bestof",
                         type=str,
                         default="",
-                        help="list the best competing solvers, per division, of given year, in a csv with year/division/name")
+                        help="list the best competing solvers, per division, of the given years, in a csv with year/division/name")
 
     parser.add_argument("--solved-benchs",
                         default=False,
@@ -2178,19 +3505,19 @@ def parse_args():
     required = parser.add_argument_group("required arguments")
     required.add_argument("-c", "--csv",
                         metavar="path[,path...]",
-                        required=True,
+                        required=required_args,
                         help="list of input csvs with results from StarExec")
     required.add_argument("-y", "--year",
                         metavar="year[,year...]",
-                        required=True,
+                        required=required_args,
                         help="list of years matching given input csvs")
     required.add_argument("-t", "--time",
                         metavar="time[,time...]",
-                        required=True,
+                        required=required_args,
                         help="list of time limits matching given input csvs")
     required.add_argument("-S", "--solvers",
                           metavar="csv",
-                          required=True,
+                          required=required_args,
                           help="csv file that maps solver ID to solver name "\
                                "and solver variant "\
                                "and identifies if a solver is competitive")
@@ -2202,6 +3529,63 @@ def parse_args():
                         default=False,
                         help="produce results for JSat 2015-2018 submission")
 
+    what_if = parser.add_argument_group(
+            "score rule variants and write scores and winners to a csv")
+    what_if.add_argument("--what-if",
+                         metavar="csv",
+                         default=None,
+                         help="score the input csvs for all combinations of "\
+                              "the rules given via --vary-* options and "\
+                              "write the scores, ranks and division winners "\
+                              "of each rule variant to the given csv")
+    what_if.add_argument("--vary-time",
+                         metavar="time[,time...]",
+                         default=None,
+                         help="list of time limits to score with (instead "\
+                              "of the time limit given via -t)")
+    what_if.add_argument("--vary-family",
+                         action="store_true",
+                         default=False,
+                         help="score with both family definitions "\
+                              "('top' and 'bot')")
+    what_if.add_argument("--vary-weighted",
+                         action="store_true",
+                         default=False,
+                         help="score with and without weighted scoring "\
+                              "scheme")
+    what_if.add_argument("--vary-skip-unknowns",
+                         action="store_true",
+                         default=False,
+                         help="score with and without benchmarks with "\
+                              "unknown status")
+    what_if.add_argument("--vary-sequential",
+                         action="store_true",
+                         default=False,
+                         help="compute sequential and parallel scores")
+
+    time_sweep = parser.add_argument_group(
+            "score for several time limits from one scoring run")
+    time_sweep.add_argument("--time-sweep",
+                            metavar="csv",
+                            default=None,
+                            help="write the scores, ranks and division "\
+                                 "winners for each time limit given via "\
+                                 "--sweep-times to the given csv")
+    time_sweep.add_argument("--sweep-times",
+                            metavar="time[,time...]",
+                            default=None,
+                            help="list of time limits of the sweep, not "\
+                                 "above the time limit given via -t "\
+                                 "(default: {} up to the time limit given "\
+                                 "via -t)".format(
+                                     ','.join(str(t) for t in g_sweep_times)))
+    time_sweep.add_argument("--cactus",
+                            metavar="csv",
+                            default=None,
+                            help="write the correctly solved score of each "\
+                                 "solver after each solved job pair sorted "\
+                                 "by time (cactus curves) to the given csv")
+
     gen_md = parser.add_argument_group(
             "generate competition results and write results .md files")
     gen_md.add_argument("--gen-md",
@@ -2224,8 +3608,13 @@ def parse_args():
                         default=None,
                         help="List the experimental divisions in "\
                                 "the selected track")
+    return parser
+
+# Parse command line arguments.
+def parse_args():
+    global g_args
 
-    g_args = parser.parse_args()
+    g_args = get_arg_parser().parse_args()
 
     if g_args.gen_md:
         if not g_args.track:
@@ -2248,6 +3637,10 @@ def parse_args():
     g_args.year = g_args.year.split(',') if g_args.year else []
     g_args.time = g_args.time.split(',') if g_args.time else []
     g_args.time = [int(t) for t in g_args.time]
+    if g_args.vary_time:
+        g_args.vary_time = [int(t) for t in g_args.vary_time.split(',')]
+    if g_args.sweep_times:
+        g_args.sweep_times = [int(t) for t in g_args.sweep_times.split(',')]
 
     if len(g_args.year) != len(g_args.csv):
         die ("Number of given years and csv files does not match.")
@@ -2255,10 +3648,8 @@ def parse_args():
         die ("Number of given time limits and csv files does not match.")
 
     if g_args.report:
-        assert '2015' in g_args.year
-        assert '2016' in g_args.year
-        assert '2017' in g_args.year
-        assert '2018' in g_args.year
+        for year in g_report_years:
+            assert year in g_args.year
 
     tmp = zip (g_args.csv, g_args.time)
     g_args.csv = dict(zip(g_args.year, tmp))
@@ -2266,6 +3657,46 @@ def parse_args():
     if g_args.divisions != "-":
         g_args.divisions = g_args.divisions.split(',')
 
+    if g_args.cache_dir and not os.path.exists(g_args.cache_dir):
+        os.makedirs(g_args.cache_dir)
+    if g_args.score_cache and not os.path.exists(g_args.score_cache):
+        os.makedirs(g_args.score_cache)
+
+
+# Start the profiler of option --profile-dump.
+#
+# returns: the profiler (pyinstrument if the profile is written as HTML, else
+#          cProfile), or None if option --profile-dump is not given
+def start_profiler():
+    global g_args
+    if not g_args.profile_dump:
+        return None
+    if g_args.profile_dump.endswith('.html'):
+        try:
+            import pyinstrument
+        except ImportError:
+            die("Writing the profile as HTML requires pyinstrument")
+        profiler = pyinstrument.Profiler()
+        profiler.start()
+    else:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    return profiler
+
+# Stop the profiler as returned by start_profiler and write the profile to
+# the file given via option --profile-dump.
+def stop_profiler(profiler):
+    global g_args
+    if profiler is None:
+        return
+    if isinstance(profiler, cProfile.Profile):
+        profiler.disable()
+        profiler.dump_stats(g_args.profile_dump)
+    else:
+        profiler.stop()
+        with open(g_args.profile_dump, 'w') as outfile:
+            outfile.write(profiler.output_html())
+    log('Wrote profile to {}'.format(g_args.profile_dump))
 
 # Main function.
 def main():
@@ -2275,7 +3706,23 @@ def main():
     pandas.set_option('display.max_rows', None)
 
     parse_args()
-    read_solvers_csv()
+
+    start = (time.perf_counter(), time.process_time())
+    profiler = start_profiler()
+    # The profile is also written if the run fails.
+    try:
+        stage = start_stage()
+        read_solvers_csv()
+        end_stage(stage, 'read_solvers_csv', g_solvers)
+        run()
+    finally:
+        stop_profiler(profiler)
+        if g_args.profile:
+            write_profile(start, g_args.profile)
+
+# Score the input csvs as selected by the command line arguments.
+def run():
+    global g_args
 
     if g_args.report:
         for year in g_args.csv:
@@ -2283,11 +3730,29 @@ def main():
             if not os.path.exists(csv):
                 die("Given csv does not exist: {}".format(csv))
         gen_results_for_report()
+    elif g_args.what_if:
+        gen_what_if_results()
+    elif g_args.time_sweep or g_args.cactus:
+        gen_time_sweep_results()
     elif g_args.gen_md:
         for year in g_args.csv:
             csv, time_limit = g_args.csv[year]
             gen_results_md_files(
                     csv, time_limit, year, g_args.gen_md[0], g_args.gen_md[1])
+    elif g_args.solved_benchs:
+        gen_solved_unknowns()
+    elif g_args.bestof != "":
+        query_best_solvers(g_args.csv,
+                           g_args.track,
+                           g_args.solvers,
+                           g_args.divisions_map,
+                           g_args.incremental,
+                           g_args.cache_dir,
+                           [g_args.sequential]).to_csv(
+                path_or_buf=g_args.bestof,
+                columns=["year", "division", "name", "solver_id",
+                         "configuration_id"],
+                index=False)
     else:
         data = []
         for year in g_args.csv:
@@ -2301,41 +3766,13 @@ def main():
                              g_args.use_families,
                              g_args.skip_unknowns,
                              g_args.sequential)
-            if g_args.solved_benchs:
-              df[["benchmark", "result"]].to_csv(
-                path_or_buf = "solvedUnknowns" + str(year) + ".csv",
-                columns = ["benchmark","result"], index=False)
-              continue
             data.append(df)
-            if (g_args.bestof != ""):
-              grouped = group_and_rank_solvers(df, g_args.sequential)
-              grouped['name'] = grouped.solver_id.map(get_solver_name)
-              # get winner *including non-competitive*
-              winners = grouped[\
-                          (grouped["rank"] == 1) &\
-                          (grouped["score_correct"] > 0) &\
-                          (grouped["score_error"] == 0)
-                        ]
-              winners = winners.reset_index()\
-                .drop_duplicates(["year", "division"], keep="first")
-              if g_args.divisions_map:
-                # only keep actual divisions
-                divisionInfo = json.load(open(g_args.divisions_map))
-                trackDivisions = list(divisionInfo[g_tracks[g_args.track]].keys())
-                winners = winners.drop(winners[~winners.division.isin(trackDivisions)].index)
-
-              winners[["year", "division", "name","solver_id", "configuration_id"]]\
-                      .to_csv(path_or_buf = g_args.bestof, \
-                              columns = ["division", "name","solver_id", "configuration_id"], \
-                              index = False)
-            else:
-              bl = biggest_lead_ranking(df, g_args.sequential)
-              lc = largest_contribution_ranking(df, time_limit, g_args.sequential)
-              print(grouped)
-              print(bl)
-              print(lc)
-        if g_args.solved_benchs:
-          return
+            grouped = group_and_rank_solvers(df, g_args.sequential)
+            bl = biggest_lead_ranking(df, g_args.sequential)
+            lc = largest_contribution_ranking(df, time_limit, g_args.sequential)
+            print(grouped)
+            print(bl)
+            print(lc)
         result = pandas.concat(data, ignore_index = True)
 
 if __name__ == "__main__":
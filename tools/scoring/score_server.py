@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+#
+# This script runs score.py as a long-running local scoring server that keeps
+# the normalized results of the input csvs and the solvers csvs in memory,
+# and answers queries with the command line arguments of score.py, e.g.:
+#
+#   ./score_server.py serve -s /tmp/score.sock &
+#   ./score_server.py query -s /tmp/score.sock -- \
+#       -c results.csv -y 2023 -t 1200 -S solvers.csv -T sq --gen-md test
+#
+# A query has the same semantics as running score.py with the given
+# arguments in the working directory of the client (files are written by
+# the server), the output of score.py is passed to the client. Input files
+# are read again if they were modified since they were loaded.
+#
+# This script requires the pandas data analysis framework
+
+from argparse import ArgumentParser, REMAINDER
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import time
+import traceback
+
+# score.py (and pandas) is only imported by the server, such that queries do
+# not pay for importing it (see serve).
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+score = None
+
+g_args = None
+
+
+# Print error message and exit.
+def die(msg):
+    print("error: {}".format(msg))
+    sys.exit(1)
+
+
+# Log message.
+def log(string):
+    print("[score_server] {}".format(string))
+
+
+# Run score.py with the given command line arguments in the given working
+# directory.
+#
+# returns: a tuple (status, output) with the exit status and the output
+#          (stdout and stderr) of score.py
+def run_query(argv, cwd):
+    output = io.StringIO()
+    status = 0
+    sys.argv = ['score.py'] + argv
+    try:
+        os.chdir(cwd)
+        score.reset_run_state()
+        with contextlib.redirect_stdout(output), \
+             contextlib.redirect_stderr(output):
+            score.main()
+    except SystemExit as e:
+        # Exit status of sys.exit(), argparse and die()
+        if e.code is None or isinstance(e.code, int):
+            status = e.code or 0
+        else:
+            status = 1
+            output.write("{}\n".format(e.code))
+    except Exception:
+        status = 1
+        output.write(traceback.format_exc())
+    return status, output.getvalue()
+
+
+# Handler of the connections to the scoring server. A client sends a json
+# object with the command line arguments ('argv') and the working directory
+# ('cwd') of a query and closes its end of the connection, the server
+# answers with a json object with the exit status ('status') and the output
+# ('output') of the query.
+class QueryHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        global g_args
+        start = time.time()
+        try:
+            request = json.loads(self.rfile.read().decode())
+            argv, cwd = request['argv'], request['cwd']
+        except (ValueError, KeyError) as e:
+            response = {'status': 1, 'output': 'invalid query: {}\n'.format(e)}
+        else:
+            status, output = run_query(argv, cwd)
+            response = {'status': status, 'output': output}
+            if g_args.log:
+                log("Query '{}' ({}, {:.3f}s)".format(
+                    ' '.join(argv), status, time.time() - start))
+        self.wfile.write(json.dumps(response).encode())
+
+
+# Serve queries on the Unix socket given via option --socket until
+# interrupted. Queries run score.py as the user of the server, hence the
+# socket is only accessible by this user.
+def serve():
+    global g_args
+    global score
+    import score
+    # Queries change the working directory of the server.
+    g_args.socket = os.path.abspath(g_args.socket)
+    if os.path.lexists(g_args.socket):
+        # Only remove the stale socket of an earlier server.
+        if not stat.S_ISSOCK(os.lstat(g_args.socket).st_mode):
+            die("Not a socket: {}".format(g_args.socket))
+        os.remove(g_args.socket)
+    score.g_memo = {}
+    # Create the socket with permissions 0600.
+    umask = os.umask(0o177)
+    try:
+        server = socketserver.UnixStreamServer(g_args.socket, QueryHandler)
+    finally:
+        os.umask(umask)
+    with server:
+        log("Listening on {}".format(g_args.socket))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(g_args.socket)
+
+
+# Send a query to the scoring server listening on the Unix socket given via
+# option --socket, print its output and exit with its exit status.
+def query():
+    global g_args
+    argv = g_args.argv
+    if argv and argv[0] == '--':
+        argv = argv[1:]
+    request = json.dumps({'argv': argv, 'cwd': os.getcwd()})
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(g_args.socket)
+            sock.sendall(request.encode())
+            sock.shutdown(socket.SHUT_WR)
+            chunks = []
+            while True:
+                chunk = sock.recv(1 << 16)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError as e:
+        die("Could not connect to scoring server {}: {}".format(
+            g_args.socket, e))
+    response = json.loads(b''.join(chunks).decode())
+    sys.stdout.write(response['output'])
+    sys.exit(response['status'])
+
+
+def parse_args():
+    global g_args
+    parser = ArgumentParser(
+            description="Local scoring server that keeps the results of "\
+                        "score.py in memory")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser(
+            'serve', help="start the scoring server")
+    serve_parser.add_argument("-s", "--socket",
+                              required=True,
+                              help="the Unix socket to listen on")
+    serve_parser.add_argument("-l", "--log",
+                              action="store_true",
+                              default=False,
+                              help="log the queries and their runtime")
+
+    query_parser = subparsers.add_parser(
+            'query', help="run score.py with the given arguments on the "\
+                          "scoring server")
+    query_parser.add_argument("-s", "--socket",
+                              required=True,
+                              help="the Unix socket of the scoring server")
+    query_parser.add_argument("argv",
+                              nargs=REMAINDER,
+                              help="the command line arguments of score.py")
+    g_args = parser.parse_args()
+
+
+def main():
+    global g_args
+    parse_args()
+    if g_args.command == 'serve':
+        serve()
+    else:
+        query()
+
+
+if __name__ == "__main__":
+    main()